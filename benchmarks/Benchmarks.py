@@ -0,0 +1,194 @@
+"""
+Benchmarks for the fixture generation and object creation hot paths.
+
+Run from the repository root:
+    python benchmarks/Benchmarks.py                    # run everything, compare against benchmarks/baseline.json
+    python benchmarks/Benchmarks.py --save-baseline    # store this run as the baseline
+    python benchmarks/Benchmarks.py --filter shipments --fail-on-regression
+
+Every benchmark reports throughput (items per second), per-call latency percentiles and the peak memory allocated
+during one call (via tracemalloc). Create benchmarks run against a local MockServer, so no network or API key is used;
+with --skip-creation the easypost client is never imported.
+
+Throughput depends on the machine, so no baseline is committed. To check a change for regressions, save a baseline
+from the unchanged revision on the same machine, then rerun with the change applied:
+    git stash && python benchmarks/Benchmarks.py --save-baseline
+    git stash pop && python benchmarks/Benchmarks.py --fail-on-regression
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import easypostdevtools.Constants as Constants  # noqa: E402
+# `easypost` is the lazy proxy, so generation-only runs don't need the client installed
+from easypostdevtools.EasyPostDevTools import EasyPostDevTools, change_api_url, easypost  # noqa: E402
+from easypostdevtools.MockServer import MockServer  # noqa: E402
+from easypostdevtools.utils.AddressIndex import AddressIndex  # noqa: E402
+from easypostdevtools.utils.FixtureBundle import FixtureBundle  # noqa: E402
+from easypostdevtools.utils.Generator import Generator  # noqa: E402
+from easypostdevtools.utils.JSONReader import JSONReader  # noqa: E402
+from easypostdevtools.utils.Random import Random  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class Benchmark:
+    def __init__(self, name: str, run: Callable[[], object], items: int = 1, calls: int = 200,
+                 setup: Callable[[], None] = None):
+        """
+        :param name: The benchmark's name in reports and baselines.
+        :param run: One call of the code under test.
+        :param items: How many items (maps, objects, ...) one call produces, for throughput.
+        :param calls: How many timed calls to make.
+        :param setup: Runs untimed before every call, e.g. to drop caches for cold measurements.
+        """
+        self.name = name
+        self.run = run
+        self.items = items
+        self.calls = calls
+        self.setup = setup
+
+    def measure(self) -> dict:
+        # one untimed call first, so warm benchmarks don't pay for lazy initialisation
+        if self.setup:
+            self.setup()
+        self.run()
+        latencies = []
+        for _ in range(self.calls):
+            if self.setup:
+                self.setup()
+            start = time.perf_counter_ns()
+            self.run()
+            latencies.append(time.perf_counter_ns() - start)
+        if self.setup:
+            self.setup()
+        tracemalloc.start()
+        self.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        latencies.sort()
+        total_seconds = sum(latencies) / 1e9
+        return {
+            "throughput": self.items * self.calls / total_seconds if total_seconds else float("inf"),
+            "p50_us": latencies[len(latencies) // 2] / 1e3,
+            "p95_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] / 1e3,
+            "mean_us": statistics.fmean(latencies) / 1e3,
+            "peak_kib": peak / 1024,
+        }
+
+
+def cold_fixtures():
+    JSONReader.clear_cache()
+    FixtureBundle.unload()
+    AddressIndex.reset()
+
+
+def generation_benchmarks() -> list[Benchmark]:
+    items = list(range(10000))
+    return [
+        Benchmark("shipments.get_map", EasyPostDevTools.Shipments.get_map, calls=2000),
+        Benchmark("shipments.get_maps[1000]", lambda: EasyPostDevTools.Shipments.get_maps(1000), items=1000, calls=20),
+        Benchmark("addresses.get_maps_different_states[2]",
+                  lambda: EasyPostDevTools.Addresses.get_maps_different_states(2), calls=2000),
+        Benchmark("addresses.get_maps[1000]", lambda: EasyPostDevTools.Addresses.get_maps(1000), items=1000,
+                  calls=20),
+        Benchmark("customs_infos.get_map[3]", lambda: EasyPostDevTools.CustomsInfos.get_map(3, True), calls=2000),
+        Benchmark("customs_infos.get_maps[1000x3]", lambda: EasyPostDevTools.CustomsInfos.get_maps(1000, 3, True),
+                  items=1000, calls=20),
+        Benchmark("pickups.get_map", EasyPostDevTools.Pickups.get_map, calls=1000),
+        Benchmark("pickups.get_maps[1000]", lambda: EasyPostDevTools.Pickups.get_maps(1000), items=1000, calls=10),
+        Benchmark("random.get_random_items_from_list[100 unique]",
+                  lambda: Random.get_random_items_from_list(items, 100, False), items=100, calls=2000),
+        Benchmark("random.get_random_items_from_list[100 duplicates]",
+                  lambda: Random.get_random_items_from_list(items, 100, True), items=100, calls=2000),
+        Benchmark("fixtures.load[warm]", lambda: JSONReader.load_json_file(Constants.CUSTOMS_ITEMS_JSON), calls=2000),
+        Benchmark("fixtures.load[cold]", lambda: JSONReader.load_json_file(Constants.CUSTOMS_ITEMS_JSON), calls=20,
+                  setup=cold_fixtures),
+        Benchmark("addresses.index[cold]", AddressIndex.shared, calls=5, setup=cold_fixtures),
+    ]
+
+
+def creation_benchmarks() -> list[Benchmark]:
+    return [
+        Benchmark("addresses.get[mock]", EasyPostDevTools.Addresses.get, calls=200),
+        Benchmark("shipments.get[mock]", EasyPostDevTools.Shipments.get, calls=200),
+        Benchmark("customs_items.get[10, mock]", lambda: EasyPostDevTools.CustomsItems.get(10, True), items=10,
+                  calls=20),
+        Benchmark("batch.get[100, mock]", lambda: EasyPostDevTools.Batch.get(100, chunk_size=50), items=100,
+                  calls=5),
+    ]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the names of benchmarks whose throughput fell by more than `threshold` (a fraction) against the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous and result["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append(name)
+    return regressions
+
+
+def report(results: dict, baseline: dict, regressions: list[str]):
+    print(f"{'benchmark':<52}{'items/s':>14}{'p50 µs':>11}{'p95 µs':>11}{'peak KiB':>11}{'vs base':>10}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        change = f"{result['throughput'] / previous['throughput'] - 1:+.1%}" if previous else "-"
+        flag = "  REGRESSED" if name in regressions else ""
+        print(f"{name:<52}{result['throughput']:>14,.0f}{result['p50_us']:>11.1f}{result['p95_us']:>11.1f}"
+              f"{result['peak_kib']:>11.1f}{change:>10}{flag}")
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="the baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="the throughput drop, as a fraction, that counts as a regression (default 0.1)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on any regression")
+    parser.add_argument("--skip-creation", action="store_true", help="skip the mock-server creation benchmarks")
+    parser.add_argument("--seed", default=0, help="the generator seed, so runs draw the same fixtures")
+    options = parser.parse_args(arguments)
+
+    results = {}
+    with Generator(options.seed):
+        benchmarks = generation_benchmarks()
+        for benchmark in benchmarks:
+            if not options.filter or options.filter in benchmark.name:
+                results[benchmark.name] = benchmark.measure()
+        if not options.skip_creation:
+            easypost.api_key = easypost.api_key or "mock"
+            EasyPostDevTools.Batch.POLL_INTERVAL = 0.001
+            with MockServer() as server:
+                change_api_url(server.url)
+                for benchmark in creation_benchmarks():
+                    if not options.filter or options.filter in benchmark.name:
+                        results[benchmark.name] = benchmark.measure()
+
+    baseline = {}
+    if os.path.exists(options.baseline) and not options.save_baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, options.threshold)
+    report(results, baseline, regressions)
+    if options.save_baseline:
+        with open(options.baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {options.baseline}")
+    if regressions and options.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Checks that the async facade's keep-alive connection pool is the one API requests actually use.
+
+Run from the repository root:
+    python benchmarks/ConnectionPoolCheck.py
+
+Starts the async facade's executor, then resolves the HTTP adapter the EasyPost session picks for API URLs (the
+default API host and a local MockServer) and verifies its pool holds `max_concurrency` connections. Exits with
+status 1 on any failure.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from easypostdevtools.AsyncEasyPostDevTools import AsyncEasyPostDevTools  # noqa: E402
+from easypostdevtools.EasyPostDevTools import easypost  # noqa: E402
+from easypostdevtools.MockServer import MockServer  # noqa: E402
+
+
+def main() -> int:
+    failures = []
+    session = easypost.requestor.requests_session
+    AsyncEasyPostDevTools.configure(24)
+    AsyncEasyPostDevTools._get_executor()
+    with MockServer() as server:
+        for url in (f"{easypost.api_base}/shipments", f"{server.url}/shipments"):
+            pool_size = session.get_adapter(url)._pool_maxsize
+            if pool_size != AsyncEasyPostDevTools.max_concurrency:
+                failures.append(f"{url} uses a pool of {pool_size} connections, expected "
+                                f"{AsyncEasyPostDevTools.max_concurrency}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Import-time regression check for the map-generation layer.
+
+Run from the repository root:
+    python benchmarks/ImportTime.py                  # check that no HTTP client or dotenv is imported, report timings
+    python benchmarks/ImportTime.py --max-ms 150     # additionally fail if the median import takes longer
+
+Each measurement imports `easypostdevtools.EasyPostDevTools` in a fresh interpreter, since a module is only imported
+once per process. Exits with status 1 if a deferred dependency is imported eagerly or the budget is exceeded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# modules that generating maps must not pull in; they load on the first API call, `setup_key`, a sharded or
+# Parquet export, or NumPy parcel sampling
+DEFERRED_MODULES = ("easypost", "dotenv", "requests", "urllib3", "multiprocessing", "concurrent.futures.process",
+                    "numpy", "pyarrow")
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import easypostdevtools.EasyPostDevTools as tools
+tools.EasyPostDevTools.Shipments.get_maps(10)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {DEFERRED_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure() -> dict:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True,
+                            env=environment).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="the number of fresh interpreters to measure")
+    parser.add_argument("--max-ms", type=float, help="fail if the median import and first maps take longer")
+    options = parser.parse_args(arguments)
+
+    measure()  # the first run writes bytecode caches; don't count it
+    results = [measure() for _ in range(options.runs)]
+    timings = sorted(result["ms"] for result in results)
+    loaded = sorted({module for result in results for module in result["loaded"]})
+    median = statistics.median(timings)
+    print(f"import + 10 shipment maps: median {median:.1f} ms, min {timings[0]:.1f} ms, max {timings[-1]:.1f} ms")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: eagerly imported {', '.join(loaded)}")
+        failed = True
+    if options.max_ms is not None and median > options.max_ms:
+        print(f"FAIL: median {median:.1f} ms is over the {options.max_ms:.1f} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Checks that enabling instrumentation leaves API traffic working and records it.
+
+Run from the repository root:
+    python benchmarks/InstrumentationCheck.py
+
+Enables instrumentation before the EasyPost client is loaded and checks that this does not import it, then creates
+objects against a local MockServer and verifies that the factory and API request metrics were recorded. Finally
+disables it and checks the client is unpatched. Exits with status 1 on any failure.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from easypostdevtools.EasyPostDevTools import EasyPostDevTools, change_api_url, easypost  # noqa: E402
+from easypostdevtools.MockServer import MockServer  # noqa: E402
+from easypostdevtools.utils.Instrumentation import InMemorySink, Instrumentation  # noqa: E402
+
+
+def main() -> int:
+    sink = InMemorySink()
+    failures = []
+    Instrumentation.reset()
+    Instrumentation.enable(sink)
+    if "easypost" in sys.modules:
+        failures.append("enable() imported the EasyPost client")
+    # the first access through the lazy proxy loads the client, which is then patched
+    easypost.api_key = easypost.api_key or "mock"
+    requestor = Instrumentation._requestor_class()
+    original = Instrumentation._original_request
+    if original is None:
+        failures.append("the API client was not patched once it was loaded")
+    with MockServer() as server:
+        change_api_url(server.url)
+        try:
+            shipment = EasyPostDevTools.Shipments.get()
+            address = EasyPostDevTools.Addresses.get()
+            if not shipment.id.startswith("shp_") or not address.id.startswith("adr_"):
+                failures.append(f"unexpected objects {shipment.id}, {address.id}")
+        except Exception as error:
+            failures.append(f"API call failed with instrumentation enabled: {error!r}")
+        finally:
+            snapshot = Instrumentation.flush()
+            Instrumentation.disable()
+
+    histograms = {(histogram["name"], tuple(sorted(histogram["labels"].items()))): histogram["count"]
+                  for histogram in snapshot["histograms"]}
+    expected = [
+        ("api_request_seconds", (("method", "POST"), ("resource", "shipments"))),
+        ("api_request_seconds", (("method", "POST"), ("resource", "addresses"))),
+        ("factory_call_seconds", (("factory", "Shipments"), ("method", "get"))),
+    ]
+    for key in expected:
+        if not histograms.get(key):
+            failures.append(f"no {key[0]} recorded for {dict(key[1])}")
+    if sink.latest is not snapshot:
+        failures.append("the sink did not receive the flushed snapshot")
+    if requestor.request is not original:
+        failures.append("the API client is still patched after disable()")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit
+
+import easypost
+
+from easypostdevtools.Constants import Addresses as AddressesConstants
+from easypostdevtools.EasyPostDevTools import EasyPostDevTools
+
+
+class AsyncEasyPostDevTools:
+    """
+    asyncio facade over `EasyPostDevTools`.
+
+    API calls run on a shared thread pool whose size matches the concurrency cap, and the EasyPost HTTP session is
+    given a keep-alive connection pool of the same size, so one event loop can drive many creations in parallel.
+    """
+    max_concurrency = 32
+    _executor = None
+    _semaphores = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def configure(max_concurrency: int):
+        """
+        Sets the maximum number of API calls in flight per event loop.
+        :param max_concurrency: The maximum number of concurrent API calls.
+        """
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        with AsyncEasyPostDevTools._lock:
+            AsyncEasyPostDevTools.max_concurrency = max_concurrency
+            if AsyncEasyPostDevTools._executor:
+                AsyncEasyPostDevTools._executor.shutdown(wait=False)
+            AsyncEasyPostDevTools._executor = None
+            AsyncEasyPostDevTools._semaphores = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _configure_connection_pool(pool_size: int):
+        session = getattr(getattr(easypost, "requestor", None), "requests_session", None)
+        if session is None:
+            return
+        import requests
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=3)
+        # requests picks the adapter with the longest matching prefix, so the one easypost mounts for its API host
+        # has to be replaced as well as the generic ones
+        parts = urlsplit(easypost.api_base)
+        for prefix in {*session.adapters, "https://", "http://", f"{parts.scheme}://{parts.netloc}"}:
+            session.mount(prefix, adapter)
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with AsyncEasyPostDevTools._lock:
+            if not AsyncEasyPostDevTools._executor:
+                max_concurrency = AsyncEasyPostDevTools.max_concurrency
+                AsyncEasyPostDevTools._configure_connection_pool(max_concurrency)
+                AsyncEasyPostDevTools._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                                                     thread_name_prefix="easypostdevtools")
+            return AsyncEasyPostDevTools._executor
+
+    @staticmethod
+    def _get_semaphore() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with AsyncEasyPostDevTools._lock:
+            semaphore = AsyncEasyPostDevTools._semaphores.get(loop)
+            if not semaphore:
+                semaphore = asyncio.Semaphore(AsyncEasyPostDevTools.max_concurrency)
+                AsyncEasyPostDevTools._semaphores[loop] = semaphore
+            return semaphore
+
+    @staticmethod
+    async def run(function: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking dev tools call on the shared pool, within the concurrency cap.
+        The caller's context (e.g. an installed seeded generator) is carried into the worker thread.
+        :param function: The blocking function to call.
+        :return: The function's result.
+        """
+        async with AsyncEasyPostDevTools._get_semaphore():
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, function, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(AsyncEasyPostDevTools._get_executor(), call)
+
+    @staticmethod
+    async def gather(*awaitables: Awaitable) -> list:
+        """
+        Awaits many dev tools calls concurrently.
+        :return: The results, in the order of the awaitables.
+        """
+        return list(await asyncio.gather(*awaitables))
+
+    class Addresses:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(country: AddressesConstants.COUNTRY = None,
+                      state: AddressesConstants.STATE = None) -> easypost.Address:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Addresses.get, country, state)
+
+        @staticmethod
+        async def get_amount(relationship: EasyPostDevTools.Addresses.ADDRESS_RELATIONSHIP,
+                             amount: int) -> list[easypost.Address]:
+            maps = EasyPostDevTools.Addresses.get_maps_amount(relationship, amount) or []
+            return await AsyncEasyPostDevTools.gather(
+                *[AsyncEasyPostDevTools.run(EasyPostDevTools.Addresses._create, _map) for _map in maps])
+
+    class Parcels:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get() -> easypost.Parcel:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Parcels.get)
+
+    class Shipments:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(to_address_map: dict = None, from_address_map: dict = None,
+                      parcel_map: dict = None) -> easypost.Shipment:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Shipments.get, to_address_map, from_address_map,
+                                                   parcel_map)
+
+        @staticmethod
+        async def get_return(to_address_map: dict = None, from_address_map: dict = None,
+                             parcel_map: dict = None) -> easypost.Shipment:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Shipments.get_return, to_address_map,
+                                                   from_address_map, parcel_map)
+
+        @staticmethod
+        async def create(shipment_map: dict) -> easypost.Shipment:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Shipments.create, shipment_map)
+
+    class Rates:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list[easypost.Rate]:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Rates.get, shipment_map, shipment)
+
+    class Smartrates:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list[easypost.Rate]:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Smartrates.get, shipment_map, shipment)
+
+    class Fees:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Fees.get, shipment_map, shipment)
+
+    class PostageLabels:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> easypost.PostageLabel:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.PostageLabels.get, shipment_map, shipment)
+
+    class Trackers:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get() -> easypost.Tracker:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Trackers.get)
+
+    class Reports:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get() -> easypost.Report:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Reports.get)
+
+    class Webhooks:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get() -> easypost.Webhook:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.Webhooks.get)
+
+    class CustomsItems:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(amount: int, allow_duplicates: bool) -> list[easypost.CustomsItem]:
+            maps = EasyPostDevTools.CustomsItems.get_random_customs_item_maps(amount, allow_duplicates)
+            return await AsyncEasyPostDevTools.gather(
+                *[AsyncEasyPostDevTools.run(lambda _map=_map: easypost.CustomsItem.create(**_map)) for _map in maps])
+
+    class CustomsInfos:
+        def __init__(self):
+            pass
+
+        @staticmethod
+        async def get(items_amount: int, allow_duplicate_items: bool) -> easypost.CustomsInfo:
+            return await AsyncEasyPostDevTools.run(EasyPostDevTools.CustomsInfos.get, items_amount,
+                                                   allow_duplicate_items)
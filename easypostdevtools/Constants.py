@@ -10,6 +10,7 @@ LABEL_OPTIONS_JSON = "json/label_options.json"
 TRACKERS_JSON = "json/trackers.json"
 OPTIONS_JSON = "json/options.json"
 PICKUPS_JSON = "json/pickups.json"
+ADDRESSES_FOLDER = "json/addresses"
 
 
 class JsonFile:
@@ -23,8 +24,18 @@ class JsonFile:
 
 
 class JsonAddressFile(JsonFile):
-    def __init__(self, abbreviation: str, parent_folder: str):
+    def __init__(self, abbreviation: str, parent_folder: str, country_code: str = "US"):
         super(JsonAddressFile, self).__init__(f"{abbreviation}-addresses", parent_folder)
+        self._abbreviation = abbreviation
+        self._country_code = country_code
+
+    @property
+    def abbreviation(self) -> str:
+        return self._abbreviation
+
+    @property
+    def country_code(self) -> str:
+        return self._country_code
 
     @property
     def address_file(self):
@@ -34,14 +45,14 @@ class JsonAddressFile(JsonFile):
 class Addresses:
     class COUNTRY(ExtendedEnum):
         UNITED_STATES = JsonAddressFile("US", "united-states")
-        CANADA = JsonAddressFile("BC", "canada")
-        CHINA = JsonAddressFile("BJ", "china")
-        HONG_KONG = JsonAddressFile("HK", "china")
-        UNITED_KINGDOM = JsonAddressFile("UK", "europe")
-        GERMANY = JsonAddressFile("DE", "europe")
-        SPAIN = JsonAddressFile("ES", "europe")
-        MEXICO = JsonAddressFile("MX", "mexico")
-        AUSTRALIA = JsonAddressFile("VT", "australia")
+        CANADA = JsonAddressFile("BC", "canada", "CA")
+        CHINA = JsonAddressFile("BJ", "china", "CN")
+        HONG_KONG = JsonAddressFile("HK", "china", "CN")
+        UNITED_KINGDOM = JsonAddressFile("UK", "europe", "UK")
+        GERMANY = JsonAddressFile("DE", "europe", "DE")
+        SPAIN = JsonAddressFile("ES", "europe", "ES")
+        MEXICO = JsonAddressFile("MX", "mexico", "MX")
+        AUSTRALIA = JsonAddressFile("VT", "australia", "AU")
 
     class STATE(ExtendedEnum):
         ARIZONA = JsonAddressFile("AZ", "united-states")
@@ -68,8 +79,10 @@ class Addresses:
             raise ValueError("Must specify either country or state")
         if country == Addresses.COUNTRY.UNITED_STATES:
             return cls.get_random_state_address_file()
-        else:
+        elif country:
             return cls.get_country_address_file(country)
+        else:
+            return cls.get_state_address_file(state)
 
     @classmethod
     def get_random_state_address_file(cls) -> str:
@@ -79,12 +92,12 @@ class Addresses:
     @classmethod
     def get_random_country_address_file(cls) -> str:
         country = cls.COUNTRY.random()
-        return country.value.address_file
+        return cls.get_address_file(country)
 
     @classmethod
     def get_random_address_file(cls, country: COUNTRY = None, state: STATE = None) -> str:
         if country:
-            return cls.get_country_address_file(country)
+            return cls.get_address_file(country)
         elif state:
             return cls.get_state_address_file(state)
         else:
@@ -93,3 +106,49 @@ class Addresses:
             else:
                 return cls.get_random_state_address_file()
 
+
+class ParcelProfile:
+    def __init__(self, weight: tuple, length: tuple, width: tuple, height: tuple, uniform: bool = False):
+        """
+        Describes a family of parcels. Each dimension is a (minimum, mode, maximum) triangular distribution,
+        in ounces for weight and inches otherwise, or a uniform (minimum, maximum) range when `uniform` is set.
+        """
+        self.weight = weight
+        self.length = length
+        self.width = width
+        self.height = height
+        self.uniform = uniform
+
+
+class CarrierParcelLimit:
+    def __init__(self, max_weight: float, max_length: float, max_length_plus_girth: float):
+        """
+        Largest parcel a carrier accepts: weight in ounces, length and length plus girth in inches.
+        """
+        self.max_weight = max_weight
+        self.max_length = max_length
+        self.max_length_plus_girth = max_length_plus_girth
+
+
+class Parcels:
+    class PROFILE(ExtendedEnum):
+        UNIFORM = ParcelProfile((0.0, 100.0), (0.0, 100.0), (0.0, 100.0), (0.0, 100.0), uniform=True)
+        ENVELOPE = ParcelProfile((0.1, 1.0, 13.0), (9.0, 10.0, 15.0), (4.0, 6.0, 12.0), (0.01, 0.1, 0.75))
+        SMALL_BOX = ParcelProfile((2.0, 16.0, 160.0), (6.0, 10.0, 18.0), (4.0, 8.0, 14.0), (2.0, 6.0, 12.0))
+        LARGE_BOX = ParcelProfile((32.0, 240.0, 1120.0), (12.0, 20.0, 36.0), (10.0, 16.0, 30.0), (8.0, 12.0, 24.0))
+        FREIGHT = ParcelProfile((1600.0, 4800.0, 32000.0), (40.0, 48.0, 96.0), (40.0, 40.0, 48.0),
+                                (24.0, 48.0, 72.0))
+
+    CARRIER_LIMITS = {
+        "USPS": CarrierParcelLimit(1120.0, 108.0, 130.0),
+        "UPS": CarrierParcelLimit(2400.0, 108.0, 165.0),
+        "FedEx": CarrierParcelLimit(2400.0, 108.0, 165.0),
+        "DHL": CarrierParcelLimit(2469.0, 47.2, 118.0),
+    }
+
+
+class Export:
+    class FORMAT(ExtendedEnum):
+        JSONL = "jsonl"
+        CSV = "csv"
+        PARQUET = "parquet"
@@ -1,15 +1,32 @@
-from enum import Enum
-from typing import Union
+from __future__ import annotations
 
-import easypost
-from dotenv import dotenv_values
+import os
+import time
+from enum import Enum
+from typing import Any, Callable, Iterator, Union
 
 import easypostdevtools.Constants as Constants
 from easypostdevtools.Constants import Addresses as AddressesConstants
+from easypostdevtools.Constants import Export as ExportConstants
+from easypostdevtools.Constants import Parcels as ParcelsConstants
 from easypostdevtools.models.ExtendedEnum import ExtendedEnum
-from easypostdevtools.utils.Dates import Dates
+from easypostdevtools.models.LaneMix import LaneMix
+from easypostdevtools.utils.AddressIndex import AddressIndex
+from easypostdevtools.utils.AddressSynthesizer import AddressSynthesizer
+from easypostdevtools.utils.BatchCreator import BatchCreator
+from easypostdevtools.utils.Dates import DateWindow
+from easypostdevtools.utils.Exporter import Exporter
+from easypostdevtools.utils.Generator import Generator
+from easypostdevtools.utils.Instrumentation import Instrumentation
 from easypostdevtools.utils.JSONReader import JSONReader
+from easypostdevtools.utils.LazyModule import LazyModule
+from easypostdevtools.utils.ParcelSampler import ParcelSampler
 from easypostdevtools.utils.Random import Random
+from easypostdevtools.utils.ReplayStore import ReplayStore
+from easypostdevtools.utils.ShipmentPool import ShipmentPool
+
+# the API client is only imported once a factory talks to the API; generating maps never loads it
+easypost = LazyModule("easypost")
 
 
 class KeyType(Enum):
@@ -26,6 +43,8 @@ def setup_key(key: str = None, env_dir: str = None, key_type: KeyType = None):
     if key:
         easypost.api_key = key
     else:
+        from dotenv import dotenv_values
+
         path = f"{env_dir}/.env"
         config = dotenv_values(dotenv_path=path)
         if key_type == KeyType.TEST:
@@ -36,13 +55,145 @@ def setup_key(key: str = None, env_dir: str = None, key_type: KeyType = None):
 
 def change_api_url(url: str):
     easypost.api_url = url
+    easypost.api_base = url
+
+
+def use_seed(seed: Union[int, str]) -> Generator:
+    """
+    Installs a seeded generator for the current thread or asyncio task, making every generated map reproducible.
+    :param seed: The seed to use.
+    :return: The installed generator; use `generator.spawn(index)` to derive independent streams for workers.
+    """
+    generator = Generator(seed)
+    generator.install()
+    return generator
+
+
+def enable_replay(path: str, ttl: float = None, max_entries: int = None) -> ReplayStore:
+    """
+    Records API-backed fixtures (rates, smartrates, fees) to disk on first use and replays them afterwards.
+    :param path: The folder to store recordings in.
+    :param ttl: The number of seconds a recording stays valid, or None to keep it forever.
+    :param max_entries: The maximum number of recordings to keep, or None for no limit.
+    :return: The replay store.
+    """
+    EasyPostDevTools.replay_store = ReplayStore(path, ttl, max_entries)
+    return EasyPostDevTools.replay_store
+
+
+def disable_replay():
+    EasyPostDevTools.replay_store = None
+
+
+def _export_shard(kind: "EasyPostDevTools.EXPORT_KIND", amount: int, path: str, format: ExportConstants.FORMAT,
+                  compress: bool, generator: Generator) -> int:
+    # runs in a worker process; the shard's generator makes its output independent of scheduling
+    with generator:
+        return Exporter.write(EasyPostDevTools.iter_export_maps(kind, amount), path, format, compress)
 
 
 class EasyPostDevTools:
+    replay_store = None
+
+    class EXPORT_KIND(ExtendedEnum):
+        ADDRESSES = 1
+        SHIPMENTS = 2
+        CUSTOMS_INFOS = 3
+        PICKUPS = 4
+
     def __init__(self):
         pass
 
+    @staticmethod
+    def iter_export_maps(kind: EXPORT_KIND, limit: int = None) -> Iterator[dict]:
+        """
+        Lazily yields maps of the given kind.
+        :param kind: What to generate.
+        :param limit: The number of maps to yield, or None to yield indefinitely.
+        """
+        if kind == EasyPostDevTools.EXPORT_KIND.ADDRESSES:
+            return EasyPostDevTools.Mapper._iter_batches(EasyPostDevTools.Addresses.get_maps, limit)
+        elif kind == EasyPostDevTools.EXPORT_KIND.SHIPMENTS:
+            return EasyPostDevTools.Shipments.iter_maps(limit)
+        elif kind == EasyPostDevTools.EXPORT_KIND.CUSTOMS_INFOS:
+            return EasyPostDevTools.CustomsInfos.iter_maps(limit)
+        elif kind == EasyPostDevTools.EXPORT_KIND.PICKUPS:
+            return EasyPostDevTools.Pickups.iter_maps(limit)
+        raise ValueError(f"Cannot export {kind}")
+
+    @staticmethod
+    def export(kind: Union[str, EXPORT_KIND], amount: int, path: str,
+               format: Union[str, ExportConstants.FORMAT] = ExportConstants.FORMAT.JSONL,
+               compress: bool = False) -> int:
+        """
+        Generates maps and streams them to a file, one chunk at a time.
+        :param kind: What to generate, e.g. EXPORT_KIND.SHIPMENTS or "shipments".
+        :param amount: The number of maps to generate.
+        :param path: The file to write.
+        :param format: JSONL, CSV (nested keys flattened to dotted columns) or PARQUET (requires pyarrow).
+        :param compress: Whether to gzip the output.
+        :return: The number of maps written.
+        """
+        if isinstance(kind, str):
+            kind = EasyPostDevTools.EXPORT_KIND[kind.upper()]
+        return Exporter.write(EasyPostDevTools.iter_export_maps(kind, amount), path, format, compress)
+
+    @staticmethod
+    def warm_fixture_pools():
+        """
+        Loads the fixture pools and builds the address index, so forked worker processes inherit them ready to use.
+        """
+        AddressIndex.shared()
+        for path in (Constants.CUSTOMS_ITEMS_JSON, Constants.CUSTOMS_INFO_JSON, Constants.PICKUPS_JSON,
+                     Constants.OPTIONS_JSON, Constants.TRACKERS_JSON):
+            JSONReader.load_json_file(path)
+
+    @staticmethod
+    def export_sharded(kind: Union[str, EXPORT_KIND], amount: int, directory: str, shards: int = None,
+                       seed: Union[int, str] = 0,
+                       format: Union[str, ExportConstants.FORMAT] = ExportConstants.FORMAT.JSONL,
+                       compress: bool = False, mp_context: Any = None) -> list[str]:
+        """
+        Generates maps across a pool of worker processes, each writing its own shard file.
+        Shard `i` always draws from `Generator(seed).spawn(i)`, so for the same seed and number of shards,
+        concatenating the files in the returned order gives the same output on every run.
+        :param kind: What to generate, e.g. EXPORT_KIND.SHIPMENTS or "shipments".
+        :param amount: The total number of maps to generate.
+        :param directory: The folder to write shard files to.
+        :param shards: The number of shards and worker processes. Defaults to the number of CPUs.
+        :param seed: The seed the shard generators are derived from.
+        :param format: JSONL, CSV or PARQUET.
+        :param compress: Whether to gzip the output.
+        :param mp_context: The multiprocessing context to start workers with. Defaults to the platform's default
+        start method; fork is never forced, since it is unsafe on macOS and in processes with running threads.
+        :return: The shard file paths, in shard order.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if isinstance(kind, str):
+            kind = EasyPostDevTools.EXPORT_KIND[kind.upper()]
+        format = ExportConstants.FORMAT(format)
+        shards = max(1, min(shards or os.cpu_count() or 1, amount or 1))
+        os.makedirs(directory, exist_ok=True)
+        extension = format.value if format == ExportConstants.FORMAT.PARQUET or not compress else f"{format.value}.gz"
+        paths = [os.path.join(directory, f"{kind.name.lower()}-{shard:05d}.{extension}") for shard in range(shards)]
+        amounts = [amount // shards + (1 if shard < amount % shards else 0) for shard in range(shards)]
+        root = Generator(seed)
+        context = mp_context or multiprocessing.get_context()
+        # forked workers share the parent's already-loaded fixture pools copy-on-write instead of re-reading them
+        if context.get_start_method() == "fork":
+            EasyPostDevTools.warm_fixture_pools()
+        with ProcessPoolExecutor(max_workers=shards, mp_context=context) as executor:
+            futures = [executor.submit(_export_shard, kind, shard_amount, path, format, compress, root.spawn(shard))
+                       for shard, (shard_amount, path) in enumerate(zip(amounts, paths))]
+            for future in futures:
+                future.result()
+        return paths
+
     class Mapper:
+        ITER_BATCH_SIZE = 1000
+
         def __init__(self):
             pass
 
@@ -54,8 +205,43 @@ class EasyPostDevTools:
         def to_map(obj: object):
             return EasyPostDevTools.Mapper.to_json(obj)
 
+        @staticmethod
+        def _to_data(response: Any) -> Any:
+            if isinstance(response, list):
+                return [EasyPostDevTools.Mapper._to_data(item) for item in response]
+            if hasattr(response, "to_dict"):
+                return response.to_dict()
+            return response
+
+        @staticmethod
+        def _to_objects(data: Any) -> Any:
+            convert = getattr(easypost, "convert_to_easypost_object", None)
+            if convert is None:
+                from easypost.easypost_object import convert_to_easypost_object as convert
+            return convert(data, easypost.api_key)
+
+        @staticmethod
+        def _replay(kind: str, shipment_map: Union[None, dict], request: Callable[[], Any],
+                    as_objects: bool = True) -> Any:
+            """
+            Runs an API-backed request through the replay store, if one is enabled.
+            Requests without a shipment map share one representative recording per kind.
+            """
+            store = EasyPostDevTools.replay_store
+            if not store:
+                return request()
+            key = ReplayStore.canonical_key(kind, shipment_map)
+            deserialize = EasyPostDevTools.Mapper._to_objects if as_objects else lambda data: data
+            return store.record_or_replay(key, request, EasyPostDevTools.Mapper._to_data, deserialize)
+
         @classmethod
         def _get_maps_from_json_file(cls, file_path: str, count: int = 1, allow_duplicates: bool = True) -> list:
+            if Instrumentation.enabled:
+                start = time.perf_counter()
+                maps = JSONReader.get_random_maps_from_json_file(file_path, count, allow_duplicates)
+                Instrumentation.observe("fixture_draw_seconds", time.perf_counter() - start, file=file_path)
+                Instrumentation.count("fixture_maps_drawn_total", count, file=file_path)
+                return maps
             return JSONReader.get_random_maps_from_json_file(file_path, count, allow_duplicates)
 
         @classmethod
@@ -63,6 +249,20 @@ class EasyPostDevTools:
             maps = cls._get_maps_from_json_file(file_path, 1, False)
             return maps[0]
 
+        @classmethod
+        def _iter_batches(cls, get_batch: Callable[[int], list], limit: int = None) -> Iterator:
+            """
+            Yields items from repeated batch draws, holding at most one batch in memory.
+            :param get_batch: Returns a list of the requested number of items.
+            :param limit: The total number of items to yield, or None to yield indefinitely.
+            """
+            remaining = limit
+            while remaining is None or remaining > 0:
+                size = cls.ITER_BATCH_SIZE if remaining is None else min(cls.ITER_BATCH_SIZE, remaining)
+                yield from get_batch(size)
+                if remaining is not None:
+                    remaining -= size
+
     class Addresses(Mapper):
 
         class ADDRESS_RELATIONSHIP(ExtendedEnum):
@@ -71,6 +271,9 @@ class EasyPostDevTools:
             SAME_COUNTRY = 3
             DIFFERENT_COUNTRY = 4
 
+        # when set, addresses drawn without a country or state follow this mix instead of a coin flip
+        lane_mix = None
+
         def __init__(self):
             super().__init__()
             pass
@@ -79,33 +282,190 @@ class EasyPostDevTools:
         def _create(address_map: dict) -> easypost.Address:
             return easypost.Address.create(**address_map)
 
+        @staticmethod
+        def _create_all(address_maps: list[dict]) -> list[easypost.Address]:
+            return BatchCreator.create_all(EasyPostDevTools.Addresses._create, address_maps).results_or_raise()
+
         @classmethod
-        def get_map(cls, country: AddressesConstants.COUNTRY = None, state: AddressesConstants.STATE = None) -> dict:
+        def get_map(cls, country: AddressesConstants.COUNTRY = None, state: AddressesConstants.STATE = None,
+                    lane_mix: LaneMix = None) -> dict:
+            lane_mix = lane_mix or cls.lane_mix
+            if lane_mix and not (country or state):
+                return cls.get_maps_for_lane_mix(1, lane_mix)[0]
             address_file = AddressesConstants.get_random_address_file(country, state)
             return cls._get_map_from_json_file(address_file)
 
+        @staticmethod
+        def set_lane_mix(lane_mix: Union[None, LaneMix]):
+            """
+            Makes addresses and shipments drawn without a country or state follow a lane mix. Pass None to reset.
+            """
+            EasyPostDevTools.Addresses.lane_mix = lane_mix
+
+        @staticmethod
+        def get_maps_for_lane_mix(amount: int, lane_mix: LaneMix = None) -> list[dict]:
+            """
+            Draws destination addresses whose regions follow a lane mix.
+            """
+            lane_mix = lane_mix or EasyPostDevTools.Addresses.lane_mix
+            if not lane_mix:
+                raise ValueError("No lane mix given or set")
+            index = AddressIndex.shared()
+            return [index.get_random_maps(index.region_rows(region), 1)[0]
+                    for region in lane_mix.sample_destinations(amount)]
+
+        @staticmethod
+        def _get_map_pairs_for_lane_mix(amount: int, lane_mix: LaneMix) -> list[tuple[dict, dict]]:
+            """
+            Draws (to, from) address pairs whose (destination, origin) regions follow a lane mix.
+            """
+            index = AddressIndex.shared()
+            pairs = []
+            for origin, destination in lane_mix.sample_lanes(amount):
+                if origin == destination:
+                    to_map, from_map = index.get_random_maps(index.region_rows(origin), 2)
+                else:
+                    to_map = index.get_random_maps(index.region_rows(destination), 1)[0]
+                    from_map = index.get_random_maps(index.region_rows(origin), 1)[0]
+                pairs.append((to_map, from_map))
+            return pairs
+
         @staticmethod
         def get(country: AddressesConstants.COUNTRY = None, state: AddressesConstants.STATE = None) -> easypost.Address:
             address_map = EasyPostDevTools.Addresses.get_map(country, state)
             return EasyPostDevTools.Addresses._create(address_map)
 
+        @classmethod
+        def get_maps(cls, amount: int, country: AddressesConstants.COUNTRY = None,
+                     state: AddressesConstants.STATE = None, lane_mix: LaneMix = None) -> list[dict]:
+            lane_mix = lane_mix or cls.lane_mix
+            if lane_mix and not (country or state):
+                return cls.get_maps_for_lane_mix(amount, lane_mix)
+            address_files = [AddressesConstants.get_random_address_file(country, state) for _ in range(amount)]
+            pools = {}
+            maps = []
+            for address_file in address_files:
+                pool = pools.get(address_file)
+                if pool is None:
+                    pool = pools[address_file] = JSONReader.load_json_file(address_file)
+                maps.append(JSONReader.copy_json_value(Random.get_random_item_from_list(pool)))
+            return maps
+
+        @staticmethod
+        def _get_map_pairs_different_states(amount: int) -> list[tuple[dict, dict]]:
+            pools = [JSONReader.load_json_file(AddressesConstants.get_state_address_file(state))
+                     for state in AddressesConstants.STATE.members()]
+            count = len(pools)
+            # offsetting the second state by 1..count-1 guarantees the two states differ
+            first_indexes = Random.get_random_items_from_list(range(count), amount, True)
+            offsets = Random.get_random_items_from_list(range(1, count), amount, True)
+            return [(JSONReader.copy_json_value(Random.get_random_item_from_list(pools[index])),
+                     JSONReader.copy_json_value(Random.get_random_item_from_list(pools[(index + offset) % count])))
+                    for index, offset in zip(first_indexes, offsets)]
+
+        @staticmethod
+        def _get_map_pairs_same_country(amount: int) -> list[tuple[dict, dict]]:
+            index = AddressIndex.shared()
+            countries = Random.get_random_items_from_list(AddressesConstants.COUNTRY.members(), amount, True)
+            pairs = []
+            for country in countries:
+                first, second = index.get_random_maps(index.region_rows(country), 2)
+                pairs.append((first, second))
+            return pairs
+
+        @staticmethod
+        def use_compact_store(enabled: bool = True):
+            """
+            Switches the address index to a columnar store that builds dictionaries only when maps are handed out.
+            The index is rebuilt on next use.
+            """
+            AddressIndex.reset(compact=enabled)
+
+        @staticmethod
+        def _get_maps_in_region(rows, amount: int, allow_duplicates: bool,
+                                country: Union[str, AddressesConstants.COUNTRY], state: Union[None, str]) -> list[dict]:
+            index = AddressIndex.shared()
+            if allow_duplicates or amount <= len(rows):
+                return index.get_random_maps(rows, amount, allow_duplicates)
+            # not enough fixture addresses: use all of them and synthesize the rest
+            maps = index.get_random_maps(rows, len(rows))
+            exclude = {(_map["street1"], _map["street2"], _map["city"], _map["zip"]) for _map in maps}
+            maps.extend(AddressSynthesizer.shared().get_maps(amount - len(maps), country, state, exclude))
+            return Random.get_random_items_from_list(maps, len(maps), False)
+
+        @staticmethod
+        def get_maps_in_country(country_code: Union[str, AddressesConstants.COUNTRY], amount: int = 1,
+                                allow_duplicates: bool = False) -> list[dict]:
+            """
+            Draws addresses in a country.
+            :param country_code: An ISO code, which covers every fixture with that code (CN includes Hong Kong), or a
+            `COUNTRY` member, which keeps to that member's fixture file.
+            """
+            index = AddressIndex.shared()
+            if isinstance(country_code, AddressesConstants.COUNTRY):
+                rows = index.region_rows(country_code)
+            else:
+                rows = index.country_rows(country_code)
+            return EasyPostDevTools.Addresses._get_maps_in_region(rows, amount, allow_duplicates, country_code, None)
+
+        @staticmethod
+        def get_maps_in_state(state: str, amount: int = 1, allow_duplicates: bool = False,
+                              country_code: str = "US") -> list[dict]:
+            rows = AddressIndex.shared().state_rows(state, country_code)
+            return EasyPostDevTools.Addresses._get_maps_in_region(rows, amount, allow_duplicates, country_code, state)
+
+        @staticmethod
+        def get_synthetic_maps(amount: int, country_code: str = None, state: str = None) -> list[dict]:
+            """
+            Composes unique addresses that are not in the fixture files, from the streets, units and
+            (city, state, ZIP) combinations that are.
+            """
+            return AddressSynthesizer.shared().get_maps(amount, country_code, state)
+
+        @staticmethod
+        def iter_synthetic_maps(country_code: str = None, state: str = None, limit: int = None) -> Iterator[dict]:
+            return AddressSynthesizer.shared().iter_maps(country_code, state, limit)
+
+        @staticmethod
+        def get_maps_in_city(city: str, state: str, amount: int = 1, allow_duplicates: bool = False,
+                             country_code: str = "US") -> list[dict]:
+            index = AddressIndex.shared()
+            return index.get_random_maps(index.city_rows(city, state, country_code), amount, allow_duplicates)
+
+        @staticmethod
+        def get_maps_in_zip(zip_code: str, amount: int = 1, allow_duplicates: bool = False) -> list[dict]:
+            index = AddressIndex.shared()
+            return index.get_random_maps(index.zip_rows(zip_code), amount, allow_duplicates)
+
+        @staticmethod
+        def get_map_in_zip(zip_code: str) -> dict:
+            return EasyPostDevTools.Addresses.get_maps_in_zip(zip_code)[0]
+
+        @staticmethod
+        def get_maps_same_city(amount: int) -> list[dict]:
+            index = AddressIndex.shared()
+            cities = index.cities(min_size=amount)
+            if not cities:
+                raise ValueError(f"No city has {amount} addresses")
+            country, state, city = Random.get_random_item_from_list(cities)
+            return index.get_random_maps(index.city_rows(city, state, country), amount)
+
         @classmethod
         def get_maps_same_state(cls, amount: int) -> list[dict]:
             state = AddressesConstants.STATE.random()
-            state_address_file = AddressesConstants.get_random_address_file(None, state)
-            return cls._get_maps_from_json_file(state_address_file, amount, False)
+            return cls.get_maps_in_state(state.value.abbreviation, amount)
 
         @staticmethod
         def get_same_state(amount: int) -> list[easypost.Address]:
             maps = EasyPostDevTools.Addresses.get_maps_same_state(amount)
-            return [EasyPostDevTools.Addresses._create(**_map) for _map in maps]
+            return EasyPostDevTools.Addresses._create_all(maps)
 
         @staticmethod
         def get_maps_different_states(amount: int) -> list[dict]:
             if amount > AddressesConstants.STATE.amount():
                 raise ValueError(f"Amount cannot be greater than {AddressesConstants.STATE.amount()}")
             maps = []
-            states = Random.get_random_items_from_list(AddressesConstants.STATE.values(), amount, False)
+            states = Random.get_random_items_from_list(AddressesConstants.STATE.members(), amount, False)
             for state in states:
                 maps.append(EasyPostDevTools.Addresses.get_map(None, state))
             return maps
@@ -113,25 +473,24 @@ class EasyPostDevTools:
         @staticmethod
         def get_different_states(amount: int) -> list[easypost.Address]:
             maps = EasyPostDevTools.Addresses.get_maps_different_states(amount)
-            return [EasyPostDevTools.Addresses._create(**_map) for _map in maps]
+            return EasyPostDevTools.Addresses._create_all(maps)
 
         @classmethod
         def get_maps_same_country(cls, amount: int) -> list[dict]:
             country = AddressesConstants.COUNTRY.random()
-            country_address_file = AddressesConstants.get_random_address_file(country, None)
-            return cls._get_maps_from_json_file(country_address_file, amount, False)
+            return cls.get_maps_in_country(country, amount)
 
         @staticmethod
         def get_same_country(amount: int) -> list[easypost.Address]:
             maps = EasyPostDevTools.Addresses.get_maps_same_country(amount)
-            return [EasyPostDevTools.Addresses._create(**_map) for _map in maps]
+            return EasyPostDevTools.Addresses._create_all(maps)
 
         @staticmethod
         def get_maps_different_countries(amount: int) -> list[dict]:
             if amount > AddressesConstants.COUNTRY.amount():
                 raise ValueError(f"Amount cannot be greater than {AddressesConstants.COUNTRY.amount()}")
             maps = []
-            countries = Random.get_random_items_from_list(AddressesConstants.COUNTRY.values(), amount, False)
+            countries = Random.get_random_items_from_list(AddressesConstants.COUNTRY.members(), amount, False)
             for country in countries:
                 maps.append(EasyPostDevTools.Addresses.get_map(country, None))
             return maps
@@ -139,7 +498,7 @@ class EasyPostDevTools:
         @staticmethod
         def get_different_countries(amount: int) -> list[easypost.Address]:
             maps = EasyPostDevTools.Addresses.get_maps_different_countries(amount)
-            return [EasyPostDevTools.Addresses._create(**_map) for _map in maps]
+            return EasyPostDevTools.Addresses._create_all(maps)
 
         @staticmethod
         def get_maps_amount(relationship: ADDRESS_RELATIONSHIP, amount: int) -> Union[None, list[dict]]:
@@ -154,6 +513,18 @@ class EasyPostDevTools:
             else:
                 return None
 
+        @classmethod
+        def iter_maps(cls, relationship: ADDRESS_RELATIONSHIP, amount: int = 2,
+                      limit: int = None) -> Iterator[list[dict]]:
+            """
+            Lazily yields groups of address maps with the given relationship.
+            :param relationship: How the addresses in each group relate to each other.
+            :param amount: The number of addresses in each group.
+            :param limit: The number of groups to yield, or None to yield indefinitely.
+            """
+            return cls._iter_batches(
+                lambda size: [cls.get_maps_amount(relationship, amount) for _ in range(size)], limit)
+
         @staticmethod
         def get_amount(relationship: ADDRESS_RELATIONSHIP, amount: int) -> list[easypost.Address]:
             if relationship == EasyPostDevTools.Addresses.ADDRESS_RELATIONSHIP.SAME_STATE:
@@ -180,6 +551,23 @@ class EasyPostDevTools:
                 "length": Random.get_random_float_in_range(0.0, 100.0)
             }
 
+        @staticmethod
+        def get_maps(amount: int, distribution: ParcelsConstants.PROFILE = ParcelsConstants.PROFILE.UNIFORM,
+                     carrier: str = None) -> list[dict]:
+            """
+            Draws a batch of parcels in one vectorized call.
+            :param amount: The number of parcel maps.
+            :param distribution: The parcel profile to draw weights (ounces) and dimensions (inches) from.
+            :param carrier: A carrier in `Constants.Parcels.CARRIER_LIMITS` whose size limits parcels are clipped to.
+            :return: The parcel maps.
+            """
+            limit = None
+            if carrier:
+                limit = ParcelsConstants.CARRIER_LIMITS.get(carrier)
+                if not limit:
+                    raise ValueError(f"No parcel limits known for carrier {carrier}")
+            return ParcelSampler.sample(amount, distribution.value, limit)
+
         @staticmethod
         def get() -> easypost.Parcel:
             return easypost.Parcel.create(**EasyPostDevTools.Parcels.get_map())
@@ -204,16 +592,24 @@ class EasyPostDevTools:
             return shipment.insure(**insurance_map)
 
     class Shipments(Mapper):
+        pool = ShipmentPool(lambda shipment_map: EasyPostDevTools.Shipments.create(shipment_map))
+
         def __init__(self):
             super().__init__()
             pass
 
         @staticmethod
-        def get_map(to_address_map: dict = None, from_address_map: dict = None, parcel_map: dict = None) -> dict:
+        def get_map(to_address_map: dict = None, from_address_map: dict = None, parcel_map: dict = None,
+                    lane_mix: LaneMix = None) -> dict:
             if not (to_address_map and from_address_map):
-                address_maps = EasyPostDevTools.Addresses.get_maps_different_states(2)
-                to_address_map = address_maps[0]
-                from_address_map = address_maps[1]
+                lane_mix = lane_mix or EasyPostDevTools.Addresses.lane_mix
+                if lane_mix:
+                    to_address_map, from_address_map = \
+                        EasyPostDevTools.Addresses._get_map_pairs_for_lane_mix(1, lane_mix)[0]
+                else:
+                    address_maps = EasyPostDevTools.Addresses.get_maps_different_states(2)
+                    to_address_map = address_maps[0]
+                    from_address_map = address_maps[1]
             if not parcel_map:
                 parcel_map = EasyPostDevTools.Parcels.get_map()
             return {
@@ -222,6 +618,31 @@ class EasyPostDevTools:
                 'parcel': parcel_map,
             }
 
+        @staticmethod
+        def get_maps(amount: int, to_address_map: dict = None, from_address_map: dict = None,
+                     parcel_map: dict = None, lane_mix: LaneMix = None) -> list[dict]:
+            lane_mix = lane_mix or EasyPostDevTools.Addresses.lane_mix
+            if to_address_map and from_address_map:
+                address_pairs = [(to_address_map, from_address_map)] * amount
+            elif lane_mix:
+                address_pairs = EasyPostDevTools.Addresses._get_map_pairs_for_lane_mix(amount, lane_mix)
+            else:
+                address_pairs = EasyPostDevTools.Addresses._get_map_pairs_different_states(amount)
+            parcel_maps = [parcel_map] * amount if parcel_map else EasyPostDevTools.Parcels.get_maps(amount)
+            return [{
+                'to_address': to_map,
+                'from_address': from_map,
+                'parcel': parcel,
+            } for (to_map, from_map), parcel in zip(address_pairs, parcel_maps)]
+
+        @classmethod
+        def iter_maps(cls, limit: int = None) -> Iterator[dict]:
+            """
+            Lazily yields shipment maps.
+            :param limit: The number of maps to yield, or None to yield indefinitely.
+            """
+            return cls._iter_batches(EasyPostDevTools.Shipments.get_maps, limit)
+
         @staticmethod
         def get_return_map(to_address_map: dict = None, from_address_map: dict = None, parcel_map: dict = None) -> dict:
             _map = EasyPostDevTools.Shipments.get_map(to_address_map, from_address_map, parcel_map)
@@ -232,18 +653,28 @@ class EasyPostDevTools:
         def get(to_address_map: dict = None, from_address_map: dict = None,
                 parcel_map: dict = None) -> easypost.Shipment:
             _map = EasyPostDevTools.Shipments.get_map(to_address_map, from_address_map, parcel_map)
-            return EasyPostDevTools.Shipments.create(**_map)
+            return EasyPostDevTools.Shipments.create(_map)
 
         @staticmethod
         def get_return(to_address_map: dict = None, from_address_map: dict = None,
                        parcel_map: dict = None) -> easypost.Shipment:
             _map = EasyPostDevTools.Shipments.get_return_map(to_address_map, from_address_map, parcel_map)
-            return EasyPostDevTools.Shipments.create(**_map)
+            return EasyPostDevTools.Shipments.create(_map)
 
         @staticmethod
         def create(shipment_map: dict) -> easypost.Shipment:
             return easypost.Shipment.create(**shipment_map)
 
+        @staticmethod
+        def get_or_create(shipment_map: dict = None) -> easypost.Shipment:
+            """
+            Reuses a recently created shipment with an identical map, or creates a new one.
+            Without a map, a new shipment is always created from a random map.
+            """
+            if not shipment_map:
+                return EasyPostDevTools.Shipments.create(EasyPostDevTools.Shipments.get_map())
+            return EasyPostDevTools.Shipments.pool.get(shipment_map)
+
         @staticmethod
         def add_insurance(shipment: easypost.Shipment, amount: float = None) -> easypost.Shipment:
             return EasyPostDevTools.Insurance.insure(shipment, amount)
@@ -275,11 +706,13 @@ class EasyPostDevTools:
 
         @staticmethod
         def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list[easypost.Rate]:
-            if not shipment:
-                if not shipment_map:
-                    shipment_map = EasyPostDevTools.Shipments.get_map()
-                shipment = EasyPostDevTools.Shipments.create(**shipment_map)
-            return shipment.get_rates()
+            if shipment:
+                return shipment.get_rates()
+
+            def request():
+                return EasyPostDevTools.Shipments.get_or_create(shipment_map).get_rates()
+
+            return EasyPostDevTools.Mapper._replay("rates", shipment_map, request)
 
     class Smartrates(Mapper):
         def __init__(self):
@@ -288,11 +721,13 @@ class EasyPostDevTools:
 
         @staticmethod
         def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list[easypost.Rate]:
-            if not shipment:
-                if not shipment_map:
-                    shipment_map = EasyPostDevTools.Shipments.get_map()
-                shipment = easypost.Shipment.create(**shipment_map)
-            return shipment.get_smartrates()
+            if shipment:
+                return shipment.get_smartrates()
+
+            def request():
+                return EasyPostDevTools.Shipments.get_or_create(shipment_map).get_smartrates()
+
+            return EasyPostDevTools.Mapper._replay("smartrates", shipment_map, request, as_objects=False)
 
     class TaxIdentifiers(Mapper):
         def __init__(self):
@@ -315,10 +750,101 @@ class EasyPostDevTools:
             _map = EasyPostDevTools.Trackers.get_map()
             return easypost.Tracker.create(**_map)
 
-    class Batch:
+    class Batch(Mapper):
+        CHUNK_SIZE = 100
+        POLL_INTERVAL = 0.5
+        MAX_POLL_INTERVAL = 15.0
+        TIMEOUT = 600.0
+        FAILED_STATES = ("creation_failed", "purchase_failed")
+
         def __init__(self):
+            super().__init__()
             pass
 
+        @staticmethod
+        def get_map(amount: int = 1, shipment_maps: list[dict] = None) -> dict:
+            return {'shipments': shipment_maps or EasyPostDevTools.Shipments.get_maps(amount)}
+
+        @staticmethod
+        def wait(batch: easypost.Batch, done: Callable[[easypost.Batch], bool],
+                 timeout: float = None) -> easypost.Batch:
+            """
+            Refreshes a batch until `done(batch)` holds, backing off exponentially between polls.
+            :param batch: The batch to poll.
+            :param done: Whether the batch has reached the wanted state.
+            :param timeout: The number of seconds to wait. Defaults to `Batch.TIMEOUT`.
+            :return: The refreshed batch.
+            """
+            deadline = time.monotonic() + (timeout or EasyPostDevTools.Batch.TIMEOUT)
+            interval = EasyPostDevTools.Batch.POLL_INTERVAL
+            while not done(batch):
+                if batch.state in EasyPostDevTools.Batch.FAILED_STATES:
+                    raise RuntimeError(f"Batch {batch.id} ended in state {batch.state}")
+                if time.monotonic() + interval > deadline:
+                    raise TimeoutError(f"Batch {batch.id} is still {batch.state}")
+                time.sleep(interval)
+                interval = min(interval * 2, EasyPostDevTools.Batch.MAX_POLL_INTERVAL)
+                batch.refresh()
+            return batch
+
+        @staticmethod
+        def create(shipment_maps: list[dict], chunk_size: int = None, buy: bool = False, carrier: str = None,
+                   service: str = None, label_format: str = None, timeout: float = None) -> list[easypost.Batch]:
+            """
+            Creates shipments through the batch endpoint, one request per chunk instead of one per shipment.
+            Every chunk is submitted before any is polled, so the API works on all of them at once.
+            :param shipment_maps: The shipments to create.
+            :param chunk_size: The number of shipments per batch. Defaults to `Batch.CHUNK_SIZE`.
+            :param buy: Whether to buy postage for the shipments.
+            :param carrier: The carrier to buy with. Required when buying, since a batch does not pick rates itself.
+            :param service: The service to buy. Required when buying.
+            :param label_format: A label file format (e.g. "PDF") to generate one combined label per batch in.
+            :param timeout: The number of seconds to wait for each step of each batch.
+            :return: The batches, in chunk order.
+            """
+            if buy and not (carrier and service):
+                raise ValueError("Buying a batch requires a carrier and a service")
+            chunk_size = chunk_size or EasyPostDevTools.Batch.CHUNK_SIZE
+            if carrier or service:
+                rate = {key: value for key, value in (('carrier', carrier), ('service', service)) if value}
+                shipment_maps = [dict(shipment_map, **rate) for shipment_map in shipment_maps]
+            batches = [
+                easypost.Batch.create(**EasyPostDevTools.Batch.get_map(shipment_maps=shipment_maps[i:i + chunk_size]))
+                for i in range(0, len(shipment_maps), chunk_size)
+            ]
+            for batch in batches:
+                EasyPostDevTools.Batch.wait(batch, lambda b: b.state == "created", timeout)
+            if buy:
+                for batch in batches:
+                    batch.buy()
+                for batch in batches:
+                    EasyPostDevTools.Batch.wait(batch, lambda b: b.state == "purchased", timeout)
+            if label_format:
+                for batch in batches:
+                    batch.label(file_format=label_format)
+                for batch in batches:
+                    EasyPostDevTools.Batch.wait(batch, lambda b: b.get("label_url"), timeout)
+            return batches
+
+        @staticmethod
+        def get(amount: int, chunk_size: int = None, buy: bool = False, carrier: str = None, service: str = None,
+                label_format: str = None) -> list[easypost.Batch]:
+            shipment_maps = EasyPostDevTools.Shipments.get_maps(amount)
+            return EasyPostDevTools.Batch.create(shipment_maps, chunk_size, buy, carrier, service, label_format)
+
+        @staticmethod
+        def get_shipments(batches: list[easypost.Batch]) -> list[easypost.Shipment]:
+            """
+            Retrieves the full shipments of batches. Batches only list shipment summaries, so this costs one request
+            per shipment; they run concurrently.
+            """
+            shipment_ids = [shipment.id for batch in batches for shipment in batch.shipments]
+            return BatchCreator.create_all(easypost.Shipment.retrieve, shipment_ids).results_or_raise()
+
+        @staticmethod
+        def get_labels(batches: list[easypost.Batch]) -> list[str]:
+            return [batch.label_url for batch in batches]
+
     class CustomsItems(Mapper):
         def __init__(self):
             super().__init__()
@@ -328,10 +854,19 @@ class EasyPostDevTools:
         def get_random_customs_item_maps(cls, amount: int, allow_duplicates: bool) -> list[dict]:
             return cls._get_maps_from_json_file(Constants.CUSTOMS_ITEMS_JSON, amount, allow_duplicates)
 
+        @classmethod
+        def iter_maps(cls, limit: int = None) -> Iterator[dict]:
+            """
+            Lazily yields customs item maps. Items repeat, since the fixture pool is finite.
+            :param limit: The number of maps to yield, or None to yield indefinitely.
+            """
+            return cls._iter_batches(lambda size: cls.get_random_customs_item_maps(size, True), limit)
+
         @staticmethod
         def get(amount: int, allow_duplicates: bool) -> list[easypost.CustomsItem]:
             customs_item_maps = EasyPostDevTools.CustomsItems.get_random_customs_item_maps(amount, allow_duplicates)
-            return [easypost.CustomsItem.create(**customs_item_map) for customs_item_map in customs_item_maps]
+            return BatchCreator.create_all(lambda _map: easypost.CustomsItem.create(**_map),
+                                           customs_item_maps).results_or_raise()
 
     class CustomsInfos(Mapper):
         def __init__(self):
@@ -345,6 +880,31 @@ class EasyPostDevTools:
                                                                                               allow_duplicate_items)
             return _map
 
+        @classmethod
+        def get_maps(cls, amount: int, items_amount: int, allow_duplicate_items: bool) -> list[dict]:
+            maps = cls._get_maps_from_json_file(Constants.CUSTOMS_INFO_JSON, amount, True)
+            if allow_duplicate_items:
+                # one draw for every item of every customs info
+                items = EasyPostDevTools.CustomsItems.get_random_customs_item_maps(amount * items_amount, True)
+                for index, _map in enumerate(maps):
+                    _map['custom_items'] = items[index * items_amount:(index + 1) * items_amount]
+            else:
+                for _map in maps:
+                    _map['custom_items'] = EasyPostDevTools.CustomsItems.get_random_customs_item_maps(items_amount,
+                                                                                                      False)
+            return maps
+
+        @classmethod
+        def iter_maps(cls, limit: int = None, items_amount: int = 1,
+                      allow_duplicate_items: bool = True) -> Iterator[dict]:
+            """
+            Lazily yields customs info maps.
+            :param limit: The number of maps to yield, or None to yield indefinitely.
+            :param items_amount: The number of customs items in each map.
+            :param allow_duplicate_items: Whether a map may contain the same customs item more than once.
+            """
+            return cls._iter_batches(lambda size: cls.get_maps(size, items_amount, allow_duplicate_items), limit)
+
         @staticmethod
         def get(items_amount: int, allow_duplicate_items: bool) -> easypost.CustomsInfo:
             customs_info_map = EasyPostDevTools.CustomsInfos.get_map(items_amount, allow_duplicate_items)
@@ -361,16 +921,70 @@ class EasyPostDevTools:
 
         @staticmethod
         def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> list:
-            if not shipment:
-                if not shipment_map:
-                    shipment_map = EasyPostDevTools.Shipments.get_map()
-                shipment = easypost.Shipment.create(**shipment_map)
-            return shipment.fees
+            if shipment:
+                return shipment.fees
+
+            def request():
+                return EasyPostDevTools.Shipments.get_or_create(shipment_map).fees
 
-    class Orders:
+            return EasyPostDevTools.Mapper._replay("fees", shipment_map, request)
+
+    class Orders(Mapper):
         def __init__(self):
+            super().__init__()
             pass
 
+        @staticmethod
+        def get_map(shipments_amount: int = 2, to_address_map: dict = None, from_address_map: dict = None,
+                    lane_mix: LaneMix = None) -> dict:
+            """
+            Builds an order whose shipments all share one to/from address pair.
+            :param shipments_amount: The number of shipments (parcels) in the order.
+            """
+            if not (to_address_map and from_address_map):
+                shipment_map = EasyPostDevTools.Shipments.get_map(lane_mix=lane_mix)
+                to_address_map = shipment_map['to_address']
+                from_address_map = shipment_map['from_address']
+            parcel_maps = EasyPostDevTools.Parcels.get_maps(shipments_amount)
+            return {
+                'to_address': to_address_map,
+                'from_address': from_address_map,
+                'shipments': [{'parcel': parcel_map} for parcel_map in parcel_maps],
+            }
+
+        @staticmethod
+        def get_maps(amount: int, shipments_amount: int = 2, lane_mix: LaneMix = None) -> list[dict]:
+            shipment_maps = EasyPostDevTools.Shipments.get_maps(amount, lane_mix=lane_mix)
+            parcel_maps = EasyPostDevTools.Parcels.get_maps(amount * shipments_amount)
+            return [{
+                'to_address': shipment_map['to_address'],
+                'from_address': shipment_map['from_address'],
+                'shipments': [{'parcel': parcel_map}
+                              for parcel_map in parcel_maps[index * shipments_amount:(index + 1) * shipments_amount]],
+            } for index, shipment_map in enumerate(shipment_maps)]
+
+        @staticmethod
+        def create(order_map: dict) -> easypost.Order:
+            return easypost.Order.create(**order_map)
+
+        @staticmethod
+        def get(shipments_amount: int = 2) -> easypost.Order:
+            """
+            Creates an order of several shipments in one request.
+            """
+            return EasyPostDevTools.Orders.create(EasyPostDevTools.Orders.get_map(shipments_amount))
+
+        @staticmethod
+        def buy(order: easypost.Order, carrier: str = None, service: str = None) -> easypost.Order:
+            """
+            Buys every shipment of an order at once, at the given carrier service or the cheapest one.
+            """
+            if not (carrier and service):
+                rate = min((rate for rate in order.rates if not carrier or rate.carrier == carrier),
+                           key=lambda rate: float(rate.rate))
+                carrier, service = rate.carrier, rate.service
+            return order.buy(carrier=carrier, service=service)
+
     class Pickups(Mapper):
         def __init__(self):
             super().__init__()
@@ -387,11 +1001,31 @@ class EasyPostDevTools:
             shipment_map = EasyPostDevTools.Shipments.get_map(parcel_map=parcel_map, from_address_map=from_address_map,
                                                               to_address_map=to_address_map)
             _map['shipment'] = shipment_map
-            dates = Dates.get_future_dates(2)
-            _map['min_datetime'] = Dates.to_string(dates[0])
-            _map['max_datetime'] = Dates.to_string(dates[1])
+            _map['min_datetime'], _map['max_datetime'] = DateWindow().get_future_date_strings(2)
             return _map
 
+        @classmethod
+        def get_maps(cls, amount: int) -> list[dict]:
+            maps = cls._get_maps_from_json_file(Constants.PICKUPS_JSON, amount, True)
+            address_pairs = EasyPostDevTools.Addresses._get_map_pairs_same_country(amount)
+            parcel_maps = EasyPostDevTools.Parcels.get_maps(amount)
+            window = DateWindow()
+            for _map, (to_address_map, from_address_map), parcel_map in zip(maps, address_pairs, parcel_maps):
+                _map['address'] = to_address_map
+                _map['shipment'] = EasyPostDevTools.Shipments.get_map(parcel_map=parcel_map,
+                                                                      from_address_map=from_address_map,
+                                                                      to_address_map=to_address_map)
+                _map['min_datetime'], _map['max_datetime'] = window.get_future_date_strings(2)
+            return maps
+
+        @classmethod
+        def iter_maps(cls, limit: int = None) -> Iterator[dict]:
+            """
+            Lazily yields pickup maps.
+            :param limit: The number of maps to yield, or None to yield indefinitely.
+            """
+            return cls._iter_batches(cls.get_maps, limit)
+
     class Reports(Mapper):
         def __init__(self):
             super().__init__()
@@ -399,11 +1033,11 @@ class EasyPostDevTools:
 
         @staticmethod
         def get_map() -> dict:
-            dates = Dates.get_past_dates(2)
+            end_date, start_date = DateWindow().get_past_date_strings(2)
             return {
                 'shipment': {
-                    'start_date': Dates.to_string(dates[1]),
-                    'end_date': Dates.to_string(dates[0])
+                    'start_date': start_date,
+                    'end_date': end_date
                 }
             }
 
@@ -412,10 +1046,37 @@ class EasyPostDevTools:
             report_map = EasyPostDevTools.Reports.get_map()
             return easypost.Report.create(**report_map)
 
-    class ScanForms:
+    class ScanForms(Mapper):
         def __init__(self):
+            super().__init__()
             pass
 
+        @staticmethod
+        def get_map(shipments: list[easypost.Shipment]) -> dict:
+            return {'shipments': [{'id': shipment.id} for shipment in shipments]}
+
+        @staticmethod
+        def create(shipments: list[easypost.Shipment]) -> easypost.ScanForm:
+            """
+            Creates one scan form over a set of purchased shipments.
+            """
+            return easypost.ScanForm.create(**EasyPostDevTools.ScanForms.get_map(shipments))
+
+        @staticmethod
+        def get(amount: int = 2, carrier: str = "USPS", service: str = "Priority") -> easypost.ScanForm:
+            """
+            Buys shipments that share one from address in a single batch, then manifests them in one scan form.
+            :param carrier: The carrier to buy with.
+            :param service: The carrier's service to buy.
+            """
+            shipment_maps = EasyPostDevTools.Shipments.get_maps(amount)
+            from_address_map = shipment_maps[0]['from_address']
+            for shipment_map in shipment_maps:
+                shipment_map['from_address'] = from_address_map
+            batch = EasyPostDevTools.Batch.create(shipment_maps, chunk_size=amount, buy=True, carrier=carrier,
+                                                  service=service)[0]
+            return EasyPostDevTools.ScanForms.create(batch.shipments)
+
     class Webhooks(Mapper):
         def __init__(self):
             super().__init__()
@@ -461,7 +1122,38 @@ class EasyPostDevTools:
         @staticmethod
         def get(shipment_map: dict = None, shipment: easypost.Shipment = None) -> easypost.PostageLabel:
             if not shipment:
-                if not shipment_map:
-                    shipment_map = EasyPostDevTools.Shipments.get_map()
-                shipment = easypost.Shipment.create(**shipment_map)
+                shipment = EasyPostDevTools.Shipments.get_or_create(shipment_map)
             return shipment.postage_label
+
+    class ShipmentSession:
+        """
+        Creates one shipment on first use and derives rates, smartrates, fees and postage labels from it,
+        so a scenario pays for a single shipment creation.
+        """
+
+        def __init__(self, shipment_map: dict = None, shipment: easypost.Shipment = None):
+            self._shipment_map = shipment_map
+            self._shipment = shipment
+
+        @property
+        def shipment(self) -> easypost.Shipment:
+            if not self._shipment:
+                if not self._shipment_map:
+                    self._shipment_map = EasyPostDevTools.Shipments.get_map()
+                self._shipment = EasyPostDevTools.Shipments.get_or_create(self._shipment_map)
+            return self._shipment
+
+        def rates(self) -> list[easypost.Rate]:
+            return EasyPostDevTools.Rates.get(shipment=self.shipment)
+
+        def smartrates(self) -> list[easypost.Rate]:
+            return EasyPostDevTools.Smartrates.get(shipment=self.shipment)
+
+        def fees(self) -> list:
+            return EasyPostDevTools.Fees.get(shipment=self.shipment)
+
+        def postage_label(self) -> easypost.PostageLabel:
+            return EasyPostDevTools.PostageLabels.get(shipment=self.shipment)
+
+
+Instrumentation.instrument_factories(EasyPostDevTools)
@@ -0,0 +1,450 @@
+import json
+import random
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Union
+from urllib.parse import parse_qsl, urlsplit
+
+import easypostdevtools.Constants as Constants
+from easypostdevtools.utils.JSONReader import JSONReader
+
+API_PREFIX = "/v2"
+
+CARRIER_SERVICES = {
+    "USPS": [("First", 1.0, 4), ("Priority", 1.6, 2), ("Express", 3.4, 1)],
+    "UPS": [("Ground", 1.4, 5), ("2ndDayAir", 2.8, 2), ("NextDayAir", 4.6, 1)],
+    "FedEx": [("FEDEX_GROUND", 1.3, 5), ("FEDEX_2_DAY", 2.6, 2), ("PRIORITY_OVERNIGHT", 4.9, 1)],
+    "DHL": [("ExpressWorldwideNonDoc", 5.2, 3), ("ExpressEasyNonDoc", 4.4, 4)],
+}
+
+# resource path: (parameter wrapper, ID prefix, object name)
+RESOURCES = {
+    "addresses": ("address", "adr", "Address"),
+    "parcels": ("parcel", "prcl", "Parcel"),
+    "shipments": ("shipment", "shp", "Shipment"),
+    "trackers": ("tracker", "trk", "Tracker"),
+    "webhooks": ("webhook", "hook", "Webhook"),
+    "customs_items": ("customs_item", "cstitem", "CustomsItem"),
+    "customs_infos": ("customs_info", "cstinfo", "CustomsInfo"),
+    "reports": ("report", "shprep", "ShipmentReport"),
+    "batches": ("batch", "batch", "Batch"),
+    "orders": ("order", "order", "Order"),
+    "scan_forms": ("scan_form", "sf", "ScanForm"),
+}
+
+# batch state: the state a retrieve moves it to, mimicking the API finishing work in the background
+BATCH_TRANSITIONS = {
+    "creating": "created",
+    "purchasing": "purchased",
+    "label_generating": "label_generated",
+}
+
+
+class MockServer:
+    """
+    Local stand-in for the EasyPost API, answering creates with synthesized objects built from the fixture JSON.
+
+    Usage:
+        with MockServer() as server:
+            change_api_url(server.url)
+            EasyPostDevTools.Shipments.get()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._host = host
+        self._port = port
+        self._server = None
+        self._thread = None
+        self._objects = {}
+        self._shipments = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        if not self._server:
+            raise RuntimeError("Mock server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    @property
+    def objects(self) -> dict:
+        """
+        Every object created on this server, keyed by ID.
+        """
+        return self._objects
+
+    def start(self) -> "MockServer":
+        if self._server:
+            return self
+        self._server = ThreadingHTTPServer((self._host, self._port), _MockRequestHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="easypost-mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _store(self, prefix: str, object_name: str, fields: dict) -> dict:
+        now = MockServer._timestamp()
+        _object = {
+            "id": f"{prefix}_{uuid.uuid4().hex}",
+            "object": object_name,
+            "mode": "test",
+            "created_at": now,
+            "updated_at": now,
+        }
+        _object.update(fields)
+        with self._lock:
+            self._objects[_object["id"]] = _object
+        return _object
+
+    def retrieve(self, object_id: str) -> Union[None, dict]:
+        with self._lock:
+            return self._objects.get(object_id)
+
+    def _nested(self, resource: str, fields: Union[None, dict]) -> Union[None, dict]:
+        if not fields:
+            return None
+        if fields.get("id") and set(fields) == {"id"}:
+            return self.retrieve(fields["id"]) or fields
+        return self.create(resource, fields)
+
+    @staticmethod
+    def _rates(shipment_id: str, parcel: dict) -> list[dict]:
+        # rates are stable per shipment so repeated rate requests agree with each other
+        rng = random.Random(shipment_id)
+        weight = float((parcel or {}).get("weight") or 1.0)
+        rates = []
+        for carrier in JSONReader.load_json_file(Constants.CARRIERS_JSON):
+            for service, multiplier, delivery_days in CARRIER_SERVICES.get(carrier, [("Standard", 1.5, 3)]):
+                amount = (4.0 + weight * 0.12) * multiplier * rng.uniform(0.9, 1.1)
+                rates.append({
+                    "id": f"rate_{uuid.uuid4().hex}",
+                    "object": "Rate",
+                    "mode": "test",
+                    "carrier": carrier,
+                    "service": service,
+                    "rate": f"{amount:.2f}",
+                    "currency": "USD",
+                    "retail_rate": f"{amount * 1.15:.2f}",
+                    "list_rate": f"{amount * 1.08:.2f}",
+                    "delivery_days": delivery_days,
+                    "est_delivery_days": delivery_days,
+                    "delivery_date_guaranteed": False,
+                    "shipment_id": shipment_id,
+                    "carrier_account_id": f"ca_{carrier.lower()}",
+                })
+        return rates
+
+    def create(self, resource: str, fields: dict) -> dict:
+        _, prefix, object_name = RESOURCES[resource]
+        fields = dict(fields)
+        if resource == "addresses":
+            fields.setdefault("residential", None)
+            fields.setdefault("verifications", {})
+        elif resource == "shipments":
+            fields["to_address"] = self._nested("addresses", fields.get("to_address"))
+            fields["from_address"] = self._nested("addresses", fields.get("from_address"))
+            fields["parcel"] = self._nested("parcels", fields.get("parcel"))
+            fields["customs_info"] = self._nested("customs_infos", fields.get("customs_info"))
+            fields.setdefault("is_return", False)
+            fields.setdefault("options", {})
+            fields.update({
+                "status": "unknown",
+                "tracking_code": None,
+                "selected_rate": None,
+                "postage_label": None,
+                "insurance": None,
+                "refund_status": None,
+                "fees": [],
+            })
+            _object = self._store(prefix, object_name, fields)
+            _object["rates"] = MockServer._rates(_object["id"], _object["parcel"])
+            return _object
+        elif resource == "customs_infos":
+            fields["customs_items"] = [self._nested("customs_items", item)
+                                       for item in fields.get("customs_items") or []]
+        elif resource == "trackers":
+            fields.setdefault("carrier", "USPS")
+            fields.update({"status": "pre_transit", "tracking_details": [], "est_delivery_date": None})
+        elif resource == "reports":
+            fields.update({"status": "available", "url": "https://www.example.com/reports/report.csv"})
+        elif resource == "webhooks":
+            fields.setdefault("disabled_at", None)
+        elif resource == "orders":
+            fields["to_address"] = self._nested("addresses", fields.get("to_address"))
+            fields["from_address"] = self._nested("addresses", fields.get("from_address"))
+            # every shipment of an order shares the order's addresses
+            addresses = {"to_address": {"id": fields["to_address"]["id"]},
+                         "from_address": {"id": fields["from_address"]["id"]}}
+            fields["shipments"] = [self.create("shipments", dict(shipment, **addresses))
+                                   for shipment in fields.get("shipments") or []]
+            _object = self._store(prefix, object_name, fields)
+            _object["rates"] = MockServer._order_rates(_object)
+            return _object
+        elif resource == "scan_forms":
+            shipments = [self.retrieve(shipment.get("id")) for shipment in fields.get("shipments") or []]
+            shipments = [shipment for shipment in shipments if shipment]
+            if not shipments or not all(shipment["postage_label"] for shipment in shipments):
+                raise ValueError("Scan forms need at least one purchased shipment")
+            return self._store(prefix, object_name, {
+                "status": "created",
+                "message": None,
+                "address": shipments[0]["from_address"],
+                "tracking_codes": [shipment["tracking_code"] for shipment in shipments],
+                "form_url": "https://www.example.com/scan_forms/scan_form.pdf",
+                "form_file_type": None,
+                "batch_id": fields.get("batch_id"),
+                "confirmation": None,
+            })
+        elif resource == "batches":
+            _object = self._store(prefix, object_name, {
+                "reference": fields.get("reference"),
+                "state": "creating",
+                "shipments": [],
+                "label_url": None,
+                "scan_form": None,
+                "pickup": None,
+            })
+            self._shipments[_object["id"]] = []
+            return self.add_batch_shipments(_object, fields.get("shipments") or [])
+        return self._store(prefix, object_name, fields)
+
+    def add_batch_shipments(self, batch: dict, shipments: list[dict]) -> dict:
+        for shipment in shipments:
+            shipment = self._nested("shipments", shipment)
+            self._shipments[batch["id"]].append(shipment)
+            batch["shipments"].append({
+                "id": shipment["id"],
+                "reference": shipment.get("reference"),
+                "batch_status": "postage_purchased" if shipment["postage_label"] else "created",
+                "batch_message": None,
+                "tracking_code": shipment["tracking_code"],
+            })
+        MockServer._count_batch_statuses(batch)
+        return batch
+
+    @staticmethod
+    def _count_batch_statuses(batch: dict):
+        batch["num_shipments"] = len(batch["shipments"])
+        batch["status"] = {"created": 0, "queued_for_purchase": 0, "creation_failed": 0, "postage_purchased": 0,
+                           "postage_purchase_failed": 0}
+        for summary in batch["shipments"]:
+            batch["status"][summary["batch_status"]] += 1
+
+    def buy_batch(self, batch: dict) -> dict:
+        # like the API, a batch buys each shipment at its own carrier and service, and never picks a rate itself
+        for shipment, summary in zip(self._shipments[batch["id"]], batch["shipments"]):
+            if not shipment["postage_label"]:
+                carrier, service = shipment.get("carrier"), shipment.get("service")
+                rate = next((rate for rate in shipment["rates"]
+                             if rate["carrier"] == carrier and rate["service"] == service), None)
+                if rate is None:
+                    summary["batch_status"] = "postage_purchase_failed"
+                    continue
+                self.buy(shipment, {"rate": rate})
+            summary.update({"batch_status": "postage_purchased", "tracking_code": shipment["tracking_code"]})
+        MockServer._count_batch_statuses(batch)
+        batch["state"] = "purchasing" if batch["status"]["postage_purchased"] else "purchase_failed"
+        return batch
+
+    @staticmethod
+    def _order_rates(order: dict) -> list[dict]:
+        # an order's rate for a carrier service is the sum over its shipments, offered only if every shipment has it
+        totals = {}
+        for shipment in order["shipments"]:
+            for rate in shipment["rates"]:
+                key = (rate["carrier"], rate["service"])
+                total = totals.setdefault(key, dict(rate, id=f"rate_{uuid.uuid4().hex}", shipment_id=None,
+                                                    rate=0.0, count=0))
+                total["rate"] += float(rate["rate"])
+                total["count"] += 1
+        return [dict({key: value for key, value in rate.items() if key != "count"}, rate=f"{rate['rate']:.2f}")
+                for rate in totals.values() if rate["count"] == len(order["shipments"])]
+
+    def buy_order(self, order: dict, params: dict) -> dict:
+        carrier, service = params.get("carrier"), params.get("service")
+        for shipment in order["shipments"]:
+            rate = next((rate for rate in shipment["rates"]
+                         if rate["carrier"] == carrier and rate["service"] == service), None)
+            if rate is None:
+                raise ValueError(f"No {carrier} {service} rate for shipment {shipment['id']}")
+            self.buy(shipment, {"rate": rate})
+        return order
+
+    def buy(self, shipment: dict, params: dict) -> dict:
+        rate = params.get("rate") or {}
+        selected = next((r for r in shipment["rates"] if r["id"] == rate.get("id")), None) or shipment["rates"][0]
+        tracking_code = f"EZ{uuid.uuid4().int % 10 ** 10:010d}"
+        shipment.update({
+            "selected_rate": selected,
+            "tracking_code": tracking_code,
+            "status": "pre_transit",
+            "postage_label": self._store("pl", "PostageLabel", {
+                "label_url": "https://www.example.com/labels/label.png",
+                "label_file_type": "image/png",
+                "label_size": "4x6",
+                "label_date": MockServer._timestamp(),
+            }),
+            "tracker": self.create("trackers", {"tracking_code": tracking_code, "carrier": selected["carrier"]}),
+            "fees": [
+                {"object": "Fee", "type": "LabelFee", "amount": "0.00000", "charged": True, "refunded": False},
+                {"object": "Fee", "type": "PostageFee", "amount": selected["rate"], "charged": True,
+                 "refunded": False},
+            ],
+        })
+        return shipment
+
+    def handle(self, method: str, path: str, params: dict) -> tuple[int, object]:
+        """
+        Answers one API request. Failures are returned as API errors rather than raised, like the real API does:
+        malformed parameters give a 422, anything else a 500.
+        :return: The HTTP status and the JSON payload.
+        """
+        try:
+            return self._route(method, path, params)
+        except (TypeError, ValueError, KeyError, AttributeError) as error:
+            return 422, {"error": {"code": "PARAMETER.INVALID", "message": f"Invalid parameters: {error!r}"}}
+        except Exception as error:
+            return 500, {"error": {"code": "INTERNAL_SERVER_ERROR", "message": repr(error)}}
+
+    def _route(self, method: str, path: str, params: dict) -> tuple[int, object]:
+        if not path.startswith(API_PREFIX + "/"):
+            return 404, {"error": {"code": "NOT_FOUND", "message": "The requested resource could not be found."}}
+        parts = path[len(API_PREFIX) + 1:].strip("/").split("/")
+        resource = parts[0]
+        if method == "POST" and resource == "scan_forms" and len(parts) == 1:
+            try:
+                return 201, self.create("scan_forms", params.get("scan_form") or params)
+            except ValueError as error:
+                return 422, {"error": {"code": "SCAN_FORM.INVALID", "message": str(error)}}
+        if method == "POST" and resource in RESOURCES and len(parts) == 1:
+            fields = params.get(RESOURCES[resource][0]) or params
+            return 201, self.create(resource, fields)
+        if method == "POST" and resource == "reports" and len(parts) == 2:
+            fields = params.get("report") or params.get(parts[1]) or params
+            return 201, self.create("reports", dict(fields, type=parts[1]))
+        if method == "POST" and resource == "batches" and parts[1:] == ["create_and_buy"]:
+            return 201, self.buy_batch(self.create("batches", params.get("batch") or params))
+        if len(parts) >= 2:
+            _object = self.retrieve(parts[1])
+            if _object is None:
+                return 404, {"error": {"code": "NOT_FOUND", "message": f"{parts[1]} could not be found."}}
+            if len(parts) == 2 and method == "GET":
+                if resource == "batches":
+                    _object["state"] = BATCH_TRANSITIONS.get(_object["state"], _object["state"])
+                return 200, _object
+            action = parts[2] if len(parts) > 2 else None
+            if resource == "batches" and method == "POST":
+                if action == "buy":
+                    return 200, self.buy_batch(_object)
+                if action == "label":
+                    _object["state"] = "label_generating"
+                    file_format = str(params.get("file_format") or "pdf").lower()
+                    _object["label_url"] = f"https://www.example.com/labels/{_object['id']}.{file_format}"
+                    return 200, _object
+                if action == "add_shipments":
+                    return 200, self.add_batch_shipments(_object, params.get("shipments") or [])
+                if action == "scan_form":
+                    try:
+                        _object["scan_form"] = self.create("scan_forms", {"shipments": _object["shipments"],
+                                                                          "batch_id": _object["id"]})
+                    except ValueError as error:
+                        return 422, {"error": {"code": "SCAN_FORM.INVALID", "message": str(error)}}
+                    return 200, _object
+            if resource == "orders":
+                if action == "rates" and method == "GET":
+                    return 200, _object
+                if action == "buy" and method == "POST":
+                    try:
+                        return 200, self.buy_order(_object, params)
+                    except ValueError as error:
+                        return 422, {"error": {"code": "ORDER.BUY.FAILED", "message": str(error)}}
+            if resource == "shipments":
+                if action == "rates":
+                    return 200, {"rates": _object["rates"]}
+                if action == "smartrate":
+                    return 200, {"result": [dict(rate, time_in_transit={"percentile_50": rate["delivery_days"],
+                                                                        "percentile_90": rate["delivery_days"] + 1})
+                                            for rate in _object["rates"]]}
+                if action == "rerate" and method == "POST":
+                    _object["rates"] = MockServer._rates(_object["id"] + "/rerate", _object["parcel"])
+                    return 200, _object
+                if action == "buy" and method == "POST":
+                    return 200, self.buy(_object, params)
+                if action == "insure" and method == "POST":
+                    _object["insurance"] = str(params.get("amount"))
+                    return 200, _object
+                if action == "refund" and method == "POST":
+                    _object["refund_status"] = "submitted"
+                    return 200, _object
+            if method == "DELETE" and len(parts) == 2:
+                with self._lock:
+                    self._objects.pop(parts[1], None)
+                return 200, {}
+        return 404, {"error": {"code": "NOT_FOUND", "message": "The requested resource could not be found."}}
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; with Nagle's algorithm each response would stall on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, method: str):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length)
+            try:
+                params.update(json.loads(body))
+            except ValueError:
+                params.update(parse_qsl(body.decode(errors="replace")))
+            except TypeError:
+                # valid JSON that is not an object
+                params = None
+        if params is None:
+            status, payload = 422, {"error": {"code": "PARAMETER.INVALID", "message": "The body must be an object."}}
+        else:
+            status, payload = self.server.mock.handle(method, url.path, params)
+        response = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def do_GET(self):
+        self._respond("GET")
+
+    def do_POST(self):
+        self._respond("POST")
+
+    def do_PUT(self):
+        self._respond("PUT")
+
+    def do_DELETE(self):
+        self._respond("DELETE")
@@ -1,11 +1,30 @@
-import random
-from enum import Enum
+from enum import Enum, EnumMeta
+from typing import Union
 
+from easypostdevtools.utils.Generator import Generator
+
+
+class ExtendedEnumMeta(EnumMeta):
+    """
+    Precomputes an immutable member tuple and a member-to-index table when an enum class is created.
+    """
+
+    def __new__(metacls, cls, bases, classdict, **kwargs):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwargs)
+        members = tuple(enum_class)
+        enum_class._member_tuple = members
+        enum_class._member_indexes = {member: index for index, member in enumerate(members)}
+        return enum_class
+
+
+class ExtendedEnum(Enum, metaclass=ExtendedEnumMeta):
+    @classmethod
+    def members(cls) -> tuple:
+        return cls._member_tuple
 
-class ExtendedEnum(Enum):
     @classmethod
     def values(cls) -> list:
-        return [c for c in cls]
+        return list(cls._member_tuple)
 
     @classmethod
     def all(cls) -> list:
@@ -13,7 +32,7 @@ class ExtendedEnum(Enum):
 
     @classmethod
     def amount(cls) -> int:
-        return len(cls.values())
+        return len(cls._member_tuple)
 
     @classmethod
     def value_of(cls, value):
@@ -21,12 +40,24 @@ class ExtendedEnum(Enum):
 
     @classmethod
     def value_of_index(cls, index):
-        return cls(cls.values()[index])
+        return cls._member_tuple[index]
 
     @classmethod
     def index_of(cls, value):
-        return cls.values().index(value)
+        index = cls._member_indexes.get(value)
+        if index is None:
+            index = cls._member_indexes[cls(value)]
+        return index
 
     @classmethod
-    def random(cls):
-        return random.choice(cls.values())
+    def random(cls, weights: Union[None, dict, list, tuple] = None):
+        """
+        Picks a random member.
+        :param weights: Relative weights, either per member (a dict; missing members get 0) or in member order.
+        :return: The member.
+        """
+        if weights is None:
+            return Generator.current().choice(cls._member_tuple)
+        if isinstance(weights, dict):
+            weights = [weights.get(member, 0) for member in cls._member_tuple]
+        return Generator.current().choices(cls._member_tuple, weights=weights)[0]
@@ -0,0 +1,75 @@
+from typing import Union
+
+from easypostdevtools.Constants import Addresses as AddressesConstants
+from easypostdevtools.utils.AliasTable import AliasTable
+
+Region = Union[AddressesConstants.COUNTRY, AddressesConstants.STATE]
+
+
+class LaneMix:
+    """
+    Weighted mix of shipping lanes over address regions (`COUNTRY` or `STATE` members).
+
+    `weights` sets how often each region is drawn as a destination (and as an origin, without a matrix).
+    `matrix` maps an origin region to the weights of its destinations; origins are then drawn from `weights`, or in
+    proportion to each matrix row's total when no weights are given. Without weights, destinations drawn on their own
+    follow the matrix's destination totals. Alias tables for every distribution are precomputed, so each draw is O(1).
+
+    Example: 80% domestic traffic, mostly from California:
+        LaneMix(weights={STATE.CALIFORNIA: 5, STATE.TEXAS: 3, COUNTRY.CANADA: 1, COUNTRY.MEXICO: 1})
+    """
+
+    def __init__(self, weights: dict = None, matrix: dict = None):
+        if not weights and not matrix:
+            raise ValueError("Must specify either weights or matrix")
+        self._weights = dict(weights) if weights else None
+        self._matrix = {origin: dict(destinations) for origin, destinations in matrix.items()} if matrix else None
+        if weights:
+            origin_weights = self._weights
+        else:
+            origin_weights = {origin: sum(destinations.values()) for origin, destinations in self._matrix.items()}
+        self._origins = AliasTable(list(origin_weights), list(origin_weights.values()))
+        if self._weights:
+            destination_weights = self._weights
+        else:
+            # without weights, a destination is as likely as drawing a whole lane: sum of w(origin) * P(dest | origin)
+            destination_weights = {}
+            for origin, destinations in self._matrix.items():
+                total = sum(destinations.values())
+                if total <= 0:
+                    continue
+                for destination, weight in destinations.items():
+                    destination_weights[destination] = (destination_weights.get(destination, 0)
+                                                        + origin_weights[origin] * weight / total)
+        self._destinations = AliasTable(list(destination_weights), list(destination_weights.values()))
+        self._destinations_by_origin = {}
+        if self._matrix:
+            for origin, destinations in self._matrix.items():
+                if sum(destinations.values()) > 0:
+                    self._destinations_by_origin[origin] = AliasTable(list(destinations), list(destinations.values()))
+
+    @property
+    def regions(self) -> set:
+        regions = set(self._weights or ())
+        for origin, destinations in (self._matrix or {}).items():
+            regions.add(origin)
+            regions.update(destinations)
+        return regions
+
+    def sample_destination(self) -> Region:
+        return self._destinations.sample()
+
+    def sample_destinations(self, amount: int) -> list[Region]:
+        return self._destinations.sample_many(amount)
+
+    def sample_lane(self) -> tuple[Region, Region]:
+        """
+        Draws an (origin, destination) pair of regions.
+        """
+        origin = self._origins.sample()
+        destinations = self._destinations_by_origin.get(origin, self._destinations)
+        return origin, destinations.sample()
+
+    def sample_lanes(self, amount: int) -> list[tuple[Region, Region]]:
+        origins = self._origins.sample_many(amount)
+        return [(origin, self._destinations_by_origin.get(origin, self._destinations).sample()) for origin in origins]
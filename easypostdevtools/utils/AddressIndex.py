@@ -0,0 +1,179 @@
+import threading
+from array import array
+from typing import Iterable, Union
+
+import easypostdevtools.Constants as Constants
+from easypostdevtools.utils.AddressStore import AddressStore, DictAddressStore
+from easypostdevtools.utils.FixtureBundle import FixtureBundle
+from easypostdevtools.utils.JSONReader import JSONReader
+from easypostdevtools.utils.Random import Random
+
+_EMPTY = array("I")
+
+
+class AddressIndex:
+    """
+    In-memory index over address rows, by country, state, city, ZIP code and source fixture file.
+
+    Each bucket is an array of row numbers, so a random draw from any bucket is O(1).
+    Lookups are case-insensitive. With `compact`, rows live in a columnar `AddressStore` instead of dictionaries.
+    """
+    compact = False
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, addresses: Iterable[dict] = (), compact: bool = None):
+        if compact is None:
+            compact = AddressIndex.compact
+        self._store = AddressStore() if compact else DictAddressStore()
+        self._by_country = {}
+        self._by_state = {}
+        self._by_city = {}
+        self._by_zip = {}
+        self._by_file = {}
+        self._by_region = {}
+        for address in addresses:
+            self.add(address)
+
+    @property
+    def store(self) -> Union[AddressStore, DictAddressStore]:
+        return self._store
+
+    def add(self, address: dict, source: str = None) -> int:
+        """
+        Adds an address to the index.
+        :param address: The address map.
+        :param source: The package-relative fixture file the address came from, if any.
+        :return: The row of the new address.
+        """
+        row = self._store.append(address)
+        country = AddressIndex._normalize(address.get("country"))
+        state = AddressIndex._normalize(address.get("state"))
+        city = AddressIndex._normalize(address.get("city"))
+        zip_code = AddressIndex._normalize(address.get("zip"))
+        AddressIndex._bucket(self._by_country, country).append(row)
+        if state:
+            AddressIndex._bucket(self._by_state, (country, state)).append(row)
+        if city:
+            AddressIndex._bucket(self._by_city, (country, state, city)).append(row)
+        if zip_code:
+            AddressIndex._bucket(self._by_zip, zip_code).append(row)
+        if source:
+            AddressIndex._bucket(self._by_file, source).append(row)
+        if self._by_region:
+            self._by_region.clear()
+        return row
+
+    @staticmethod
+    def _bucket(buckets: dict, key) -> array:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = array("I")
+        return bucket
+
+    @staticmethod
+    def _normalize(value: Union[None, str]) -> str:
+        return (value or "").strip().upper()
+
+    @staticmethod
+    def shared() -> "AddressIndex":
+        """
+        Returns the process-wide index over every file in the address fixture folder, building it on first use.
+        """
+        if AddressIndex._shared is None:
+            with AddressIndex._lock:
+                if AddressIndex._shared is None:
+                    index = AddressIndex()
+                    for path in FixtureBundle.fixture_paths(Constants.ADDRESSES_FOLDER):
+                        for address in JSONReader.load_json_file(path):
+                            index.add(address, path)
+                    AddressIndex._shared = index
+        return AddressIndex._shared
+
+    @staticmethod
+    def reset(compact: bool = None):
+        """
+        Drops the shared index so it is rebuilt on next use.
+        :param compact: Whether the rebuilt index uses the columnar store. Unchanged if None.
+        """
+        with AddressIndex._lock:
+            if compact is not None:
+                AddressIndex.compact = compact
+            AddressIndex._shared = None
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def countries(self) -> list[str]:
+        return sorted(self._by_country)
+
+    def states(self, country: str = "US") -> list[str]:
+        country = AddressIndex._normalize(country)
+        return sorted(state for (state_country, state) in self._by_state if state_country == country)
+
+    def cities(self, min_size: int = 1) -> list[tuple[str, str, str]]:
+        """
+        Lists the (country, state, city) keys of every city with at least `min_size` addresses.
+        """
+        return [key for key, rows in self._by_city.items() if len(rows) >= min_size]
+
+    def zip_codes(self, min_size: int = 1) -> list[str]:
+        return [key for key, rows in self._by_zip.items() if len(rows) >= min_size]
+
+    def country_rows(self, country: str) -> array:
+        return self._by_country.get(AddressIndex._normalize(country), _EMPTY)
+
+    def state_rows(self, state: str, country: str = "US") -> array:
+        return self._by_state.get((AddressIndex._normalize(country), AddressIndex._normalize(state)), _EMPTY)
+
+    def city_rows(self, city: str, state: str, country: str = "US") -> array:
+        key = (AddressIndex._normalize(country), AddressIndex._normalize(state), AddressIndex._normalize(city))
+        return self._by_city.get(key, _EMPTY)
+
+    def zip_rows(self, zip_code: str) -> array:
+        return self._by_zip.get(AddressIndex._normalize(zip_code), _EMPTY)
+
+    def file_rows(self, path: str) -> array:
+        """
+        Returns the rows that came from a fixture file, e.g. `json/addresses/china/hk-addresses.min.json`.
+        """
+        return self._by_file.get(path, _EMPTY)
+
+    def region_rows(self, region: Union[Constants.Addresses.COUNTRY, Constants.Addresses.STATE]) -> array:
+        """
+        Returns the bucket for a `COUNTRY` or `STATE` member.
+        A country draws from its own fixture file rather than every address with its ISO code, since some share one
+        (`CHINA` and `HONG_KONG` are both CN). `UNITED_STATES` has no file of its own and draws from the state files.
+        Indexes built without source files fall back to the ISO code.
+        """
+        if isinstance(region, Constants.Addresses.STATE):
+            return self.state_rows(region.value.abbreviation)
+        rows = self._by_region.get(region)
+        if rows is None:
+            rows = self.file_rows(region.value.address_file)
+            if not rows and region == Constants.Addresses.COUNTRY.UNITED_STATES:
+                rows = array("I")
+                for state in Constants.Addresses.STATE.members():
+                    rows.extend(self.file_rows(state.value.address_file))
+            if not rows:
+                rows = self.country_rows(region.value.country_code)
+            self._by_region[region] = rows
+        return rows
+
+    def get_map(self, row: int) -> dict:
+        """
+        Returns a copy of the address at a row.
+        """
+        return self._store.get_map(row)
+
+    def get_random_maps(self, rows: array, amount: int, allow_duplicates: bool = False) -> list[dict]:
+        """
+        Draws address maps from a bucket of rows.
+        :param rows: The bucket to draw from.
+        :param amount: The number of addresses to draw.
+        :param allow_duplicates: Whether the same address can be drawn more than once.
+        :return: Copies of the drawn addresses.
+        """
+        if amount > 0 and not rows:
+            raise ValueError("No addresses match the query")
+        return [self.get_map(row) for row in Random.get_random_items_from_list(rows, amount, allow_duplicates)]
@@ -0,0 +1,92 @@
+from array import array
+from typing import Iterable
+
+ADDRESS_FIELDS = ("street1", "street2", "city", "state", "zip", "country")
+
+
+class DictAddressStore:
+    """
+    Address rows kept as the parsed fixture dictionaries.
+    """
+
+    def __init__(self, addresses: Iterable[dict] = ()):
+        self._addresses = list(addresses)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def append(self, address: dict) -> int:
+        self._addresses.append(address)
+        return len(self._addresses) - 1
+
+    def value(self, row: int, field: str) -> str:
+        return self._addresses[row].get(field)
+
+    def get_map(self, row: int) -> dict:
+        return dict(self._addresses[row])
+
+
+class AddressStore:
+    """
+    Columnar address rows: every field is an `array` of IDs into one interned string table,
+    so memory grows with the number of unique strings rather than the number of rows.
+    A dictionary is only built when a row is handed out.
+    """
+
+    def __init__(self, addresses: Iterable[dict] = ()):
+        self._strings = []
+        self._string_ids = {}
+        self._columns = {field: array("I") for field in ADDRESS_FIELDS}
+        self._extras = {}
+        self._size = 0
+        for address in addresses:
+            self.append(address)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def unique_strings(self) -> int:
+        return len(self._strings)
+
+    def _intern(self, value) -> int:
+        value = "" if value is None else str(value)
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def append(self, address: dict) -> int:
+        """
+        Adds an address.
+        :param address: The address map. Fields outside of `ADDRESS_FIELDS` are kept per row.
+        :return: The row of the new address.
+        """
+        row = self._size
+        for field in ADDRESS_FIELDS:
+            self._columns[field].append(self._intern(address.get(field)))
+        extras = {key: value for key, value in address.items() if key not in self._columns}
+        if extras:
+            self._extras[row] = extras
+        self._size += 1
+        return row
+
+    def value(self, row: int, field: str) -> str:
+        if row >= self._size:
+            raise IndexError("Address row out of range")
+        column = self._columns.get(field)
+        if column is None:
+            return self._extras.get(row, {}).get(field)
+        return self._strings[column[row]]
+
+    def get_map(self, row: int) -> dict:
+        if row >= self._size:
+            raise IndexError("Address row out of range")
+        strings = self._strings
+        _map = {field: strings[column[row]] for field, column in self._columns.items()}
+        extras = self._extras.get(row)
+        if extras:
+            _map.update(extras)
+        return _map
@@ -0,0 +1,176 @@
+import re
+import threading
+from typing import Iterator, Union
+
+import easypostdevtools.Constants as Constants
+from easypostdevtools.utils.AddressIndex import AddressIndex
+from easypostdevtools.utils.Random import Random
+
+_LEADING_NUMBER = re.compile(r"^(\d+)[A-Za-z]?\s+(.+)$")
+_TRAILING_NUMBER = re.compile(r"^(.+?)\s+(\d+)[A-Za-z]?$")
+_UNIT_NUMBER = re.compile(r"^(.*?)(\d+)(\D*)$")
+
+# where a street's house number goes relative to its name
+NUMBER_LEADING = 0
+NUMBER_TRAILING = 1
+NUMBER_NONE = 2
+
+
+class _Region:
+    __slots__ = ("streets", "max_number", "units", "unit_patterns", "unit_ratio", "localities")
+
+    def __init__(self, index: AddressIndex, rows):
+        streets = set()
+        units = []
+        localities = set()
+        max_number = AddressSynthesizer.MIN_HOUSE_NUMBER_CEILING
+        for row in rows:
+            street1 = index.store.value(row, "street1") or ""
+            match = _LEADING_NUMBER.match(street1)
+            if match:
+                streets.add((match.group(2), NUMBER_LEADING))
+                max_number = max(max_number, int(match.group(1)))
+            else:
+                match = _TRAILING_NUMBER.match(street1)
+                if match:
+                    streets.add((match.group(1), NUMBER_TRAILING))
+                    max_number = max(max_number, int(match.group(2)))
+                else:
+                    streets.add((street1, NUMBER_NONE))
+            street2 = index.store.value(row, "street2")
+            if street2:
+                units.append(street2)
+            localities.add((index.store.value(row, "city"), index.store.value(row, "state"),
+                            index.store.value(row, "zip"), index.store.value(row, "country")))
+        self.streets = sorted(streets)
+        self.max_number = max_number
+        self.units = sorted(set(units))
+        # numbered units (e.g. "Apt 4B") become (prefix, suffix) patterns that take any unit number
+        self.unit_patterns = sorted({(match.group(1), match.group(3))
+                                     for match in map(_UNIT_NUMBER.match, self.units) if match})
+        self.unit_ratio = len(units) / len(rows) if rows else 0.0
+        self.localities = sorted(localities)
+
+
+class AddressSynthesizer:
+    """
+    Composes new, plausible addresses from the bundled address corpus.
+
+    For a country or state, street names, units and (city, state, ZIP) combinations observed in the fixtures are
+    recombined with new house and unit numbers, so far more unique addresses are available than the fixture files
+    contain. The supply is still finite: `capacity()` gives it per region. The smallest bundled countries (e.g. DE,
+    with 5 streets and 3 localities) allow about 150,000 unique addresses. Draws become slower as a region fills up,
+    and fail once a new address cannot be found in `MAX_ATTEMPTS_PER_ADDRESS` tries.
+    """
+    MAX_ATTEMPTS_PER_ADDRESS = 100
+    # house numbers go up to the largest one seen in a region, but never less than this
+    MIN_HOUSE_NUMBER_CEILING = 9999
+    MAX_UNIT_NUMBER = 999
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, index: AddressIndex = None):
+        self._index = index or AddressIndex.shared()
+        self._regions = {}
+
+    @staticmethod
+    def shared() -> "AddressSynthesizer":
+        with AddressSynthesizer._lock:
+            if AddressSynthesizer._shared is None or AddressSynthesizer._shared._index is not AddressIndex.shared():
+                AddressSynthesizer._shared = AddressSynthesizer()
+            return AddressSynthesizer._shared
+
+    def _region(self, country_code: Union[str, Constants.Addresses.COUNTRY], state: Union[None, str]) -> _Region:
+        key = (country_code, state)
+        region = self._regions.get(key)
+        if region is None:
+            if isinstance(country_code, Constants.Addresses.COUNTRY):
+                rows = self._index.region_rows(country_code)
+            elif state:
+                rows = self._index.state_rows(state, country_code)
+            else:
+                rows = self._index.country_rows(country_code)
+            if not rows:
+                raise ValueError(f"No addresses to synthesize from for {state or ''} {country_code}".strip())
+            region = self._regions[key] = _Region(self._index, rows)
+        return region
+
+    def capacity(self, country_code: Union[str, Constants.Addresses.COUNTRY], state: str = None) -> int:
+        """
+        Returns an upper bound on the number of distinct addresses that can be synthesized for a country or state:
+        house numbers per street × street names × units (plus none) × localities.
+        """
+        return self._capacity(self._region(country_code, state))
+
+    def _capacity(self, region: _Region) -> int:
+        numbered = sum(1 for _, position in region.streets if position != NUMBER_NONE)
+        streets = numbered * region.max_number + len(region.streets) - numbered
+        units = 1
+        if region.units:
+            units += len(region.units) + len(region.unit_patterns) * self.MAX_UNIT_NUMBER
+        return streets * units * len(region.localities)
+
+    def _compose(self, region: _Region) -> dict:
+        name, position = Random.get_random_item_from_list(region.streets)
+        if position == NUMBER_NONE:
+            street1 = name
+        else:
+            number = Random.get_random_int_in_range(1, region.max_number)
+            street1 = f"{number} {name}" if position == NUMBER_LEADING else f"{name} {number}"
+        street2 = ""
+        if region.units and Random.get_random_double_in_range(0.0, 1.0) < region.unit_ratio:
+            if region.unit_patterns:
+                prefix, suffix = Random.get_random_item_from_list(region.unit_patterns)
+                street2 = f"{prefix}{Random.get_random_int_in_range(1, self.MAX_UNIT_NUMBER)}{suffix}"
+            else:
+                street2 = Random.get_random_item_from_list(region.units)
+        city, state, zip_code, country = Random.get_random_item_from_list(region.localities)
+        return {
+            "street1": street1,
+            "street2": street2,
+            "city": city,
+            "state": state,
+            "zip": zip_code,
+            "country": country,
+        }
+
+    def iter_maps(self, country_code: Union[str, Constants.Addresses.COUNTRY] = None, state: str = None,
+                  limit: int = None, exclude: set = None) -> Iterator[dict]:
+        """
+        Lazily yields unique synthesized address maps.
+        :param country_code: The country to synthesize addresses in, as an ISO code or a `COUNTRY` member (which
+        keeps to that member's fixture file). Random per address if neither it nor `state` is set.
+        :param state: The state to synthesize addresses in.
+        :param limit: The number of maps to yield, or None to yield indefinitely.
+        :param exclude: (street1, street2, city, zip) keys that must not be produced; yielded keys are added to it.
+        """
+        seen = exclude if exclude is not None else set()
+        countries = self._index.countries()
+        if state and not country_code:
+            country_code = "US"
+        yielded = 0
+        while limit is None or yielded < limit:
+            region = self._region(country_code or Random.get_random_item_from_list(countries), state)
+            for _ in range(self.MAX_ATTEMPTS_PER_ADDRESS):
+                _map = self._compose(region)
+                key = (_map["street1"], _map["street2"], _map["city"], _map["zip"])
+                if key not in seen:
+                    break
+            else:
+                raise ValueError(f"Ran out of unique addresses to synthesize; at most {self._capacity(region)} "
+                                 f"exist for this region")
+            seen.add(key)
+            yielded += 1
+            yield _map
+
+    def get_maps(self, amount: int, country_code: Union[str, Constants.Addresses.COUNTRY] = None, state: str = None,
+                 exclude: set = None) -> list[dict]:
+        """
+        Synthesizes unique address maps.
+        :param amount: The number of maps to synthesize.
+        :param country_code: The country to synthesize addresses in.
+        :param state: The state to synthesize addresses in.
+        :param exclude: (street1, street2, city, zip) keys that must not be produced.
+        :return: The synthesized maps.
+        """
+        return list(self.iter_maps(country_code, state, amount, exclude))
@@ -0,0 +1,66 @@
+from typing import Sequence
+
+from easypostdevtools.utils.Generator import Generator
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: built once in O(n) from a set of weights, then every weighted draw is O(1).
+    """
+
+    def __init__(self, items: Sequence, weights: Sequence[float]):
+        if len(items) != len(weights):
+            raise ValueError("Items and weights must have the same length")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights cannot be negative")
+        total = float(sum(weights))
+        if not items or total <= 0:
+            raise ValueError("At least one item must have a positive weight")
+        count = len(items)
+        self._items = tuple(items)
+        self._probabilities = [0.0] * count
+        self._aliases = list(range(count))
+        scaled = [weight * count / total for weight in weights]
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._probabilities[less] = scaled[less]
+            self._aliases[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # whatever is left is (up to rounding) exactly 1
+        for index in small + large:
+            self._probabilities[index] = 1.0
+
+    @property
+    def items(self) -> tuple:
+        return self._items
+
+    def sample(self):
+        """
+        Draws one weighted item.
+        """
+        rng = Generator.current()
+        index = rng.randrange(len(self._items))
+        if rng.random() < self._probabilities[index]:
+            return self._items[index]
+        return self._items[self._aliases[index]]
+
+    def sample_many(self, amount: int) -> list:
+        """
+        Draws `amount` weighted items.
+        """
+        rng = Generator.current()
+        count = len(self._items)
+        items = self._items
+        probabilities = self._probabilities
+        aliases = self._aliases
+        randrange = rng.randrange
+        uniform = rng.random
+        samples = []
+        for _ in range(amount):
+            index = randrange(count)
+            samples.append(items[index] if uniform() < probabilities[index] else items[aliases[index]])
+        return samples
@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Union
+
+# distinguishes an omitted `configure` argument from an explicit None
+_UNSET = object()
+
+
+class BatchCreationError(Exception):
+    """
+    Raised when one or more calls in a batch failed.
+    """
+
+    def __init__(self, results: list, errors: dict[int, Exception]):
+        self.results = results
+        self.errors = errors
+        super().__init__(f"{len(errors)} of {len(results)} creations failed: "
+                         f"{', '.join(f'#{index}: {error!r}' for index, error in sorted(errors.items()))}")
+
+
+class BatchResult:
+    def __init__(self, results: list, errors: dict[int, Exception]):
+        self.results = results
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def results_or_raise(self) -> list:
+        """
+        Returns the ordered results, raising if any call failed.
+        :return: The results, in the order of the inputs.
+        """
+        if self.errors:
+            raise BatchCreationError(self.results, self.errors)
+        return self.results
+
+
+class BatchCreator:
+    """
+    Fans API object creations out over a bounded thread pool.
+    """
+    max_workers = 8
+    timeout = None
+    _POLL_INTERVAL = 0.1
+
+    @staticmethod
+    def configure(max_workers: int = None, timeout: Union[None, float] = _UNSET):
+        """
+        Sets the defaults used by every batch creation. Omitted settings are left unchanged.
+        :param max_workers: The maximum number of calls in flight at once.
+        :param timeout: The number of seconds a single call may run before it is reported as failed, or None to wait.
+        """
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ValueError("Max workers must be at least 1")
+            BatchCreator.max_workers = max_workers
+        if timeout is not _UNSET:
+            BatchCreator.timeout = timeout
+
+    @staticmethod
+    def create_all(create: Callable[[dict], Any], maps: list[dict], max_workers: int = None,
+                   timeout: Union[None, float] = None) -> BatchResult:
+        """
+        Calls `create` for every map concurrently.
+        :param create: The function that creates a single object from a map.
+        :param maps: The maps to create objects from.
+        :param max_workers: The maximum number of calls in flight at once. Defaults to `BatchCreator.max_workers`.
+        :param timeout: The number of seconds a single call may run. Defaults to `BatchCreator.timeout`.
+        :return: The ordered results, with per-item errors collected rather than raised.
+        """
+        max_workers = max_workers or BatchCreator.max_workers
+        timeout = timeout if timeout is not None else BatchCreator.timeout
+        results = [None] * len(maps)
+        errors = {}
+        if not maps:
+            return BatchResult(results, errors)
+
+        started = {}
+
+        def run(index: int, _map: dict):
+            started[index] = time.monotonic()
+            return create(_map)
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(maps)))
+        try:
+            futures = {executor.submit(run, index, _map): index for index, _map in enumerate(maps)}
+            pending = set(futures)
+            while pending:
+                poll = min(timeout, BatchCreator._POLL_INTERVAL) if timeout is not None else None
+                done, pending = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as error:
+                        errors[index] = error
+                if timeout is not None:
+                    now = time.monotonic()
+                    for future in list(pending):
+                        index = futures[future]
+                        if index in started and now - started[index] > timeout:
+                            # the call keeps running in its thread, but its result is discarded
+                            errors[index] = TimeoutError(f"Creation did not finish within {timeout} seconds")
+                            pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return BatchResult(results, errors)
@@ -1,12 +1,80 @@
-from datetime import datetime, timedelta
+import functools
+from datetime import date as _date, datetime, timedelta
+from itertools import accumulate
+from typing import Callable
 
 from easypostdevtools.utils.Random import Random
 
+DATE_FORMAT = "%Y-%m-%d"
+# directives whose output depends only on the calendar day; formats made of nothing else can be cached per day
+_DATE_DIRECTIVES = frozenset("aAbBhdejmyYCgGuVUWwDFx%nt")
+
+
+@functools.lru_cache(maxsize=256)
+def _is_date_only(string_format: str) -> bool:
+    index = string_format.find("%")
+    while index != -1:
+        # flags and modifiers (e.g. %-d, %Ey) and unknown or time directives are never cached
+        if index + 1 >= len(string_format) or string_format[index + 1] not in _DATE_DIRECTIVES:
+            return False
+        index = string_format.find("%", index + 2)
+    return True
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_day(ordinal: int, string_format: str) -> str:
+    return _date.fromordinal(ordinal).strftime(string_format)
+
+
+class DateWindow:
+    """
+    Samples dates relative to a single clock snapshot, so a batch of dates never straddles midnight.
+    """
+
+    def __init__(self, now: datetime = None):
+        self.now = now or Dates.now()
+
+    def get_future_dates(self, number_of_dates: int) -> list[datetime]:
+        """
+        Returns increasing dates after the snapshot, each 1 to 30 days after the previous one.
+        """
+        offsets = accumulate(Random.get_random_items_from_list(range(1, 31), number_of_dates, True))
+        return [self.now + timedelta(days=days) for days in offsets]
+
+    def get_past_dates(self, number_of_dates: int) -> list[datetime]:
+        """
+        Returns decreasing dates before the snapshot, each 1 to 30 days before the previous one.
+        """
+        offsets = accumulate(Random.get_random_items_from_list(range(1, 31), number_of_dates, True))
+        return [self.now - timedelta(days=days) for days in offsets]
+
+    def get_future_date_strings(self, number_of_dates: int, string_format: str = DATE_FORMAT) -> list[str]:
+        return [Dates.to_string(date, string_format) for date in self.get_future_dates(number_of_dates)]
+
+    def get_past_date_strings(self, number_of_dates: int, string_format: str = DATE_FORMAT) -> list[str]:
+        return [Dates.to_string(date, string_format) for date in self.get_past_dates(number_of_dates)]
+
 
 class Dates:
+    clock: Callable[[], datetime] = datetime.now
+
+    @staticmethod
+    def now() -> datetime:
+        return Dates.clock()
+
+    @staticmethod
+    def set_clock(clock: Callable[[], datetime] = None):
+        """
+        Replaces the clock used for "now", e.g. to pin dates in tests.
+        :param clock: Returns the current time. Restores the system clock if None.
+        """
+        Dates.clock = clock or datetime.now
+
     @staticmethod
-    def to_string(date: datetime, string_format: str = "%Y-%m-%d") -> str:
-        return date.strftime(string_format)
+    def to_string(date: datetime, string_format: str = DATE_FORMAT) -> str:
+        if not _is_date_only(string_format):
+            return date.strftime(string_format)
+        return _format_day(date.toordinal(), string_format)
 
     @staticmethod
     def is_leap_year(year: int) -> bool:
@@ -40,36 +108,38 @@ class Dates:
 
     @staticmethod
     def get_future_date_this_year():
-        if Dates.is_last_day_of_year(datetime.now()):
+        now = Dates.now()
+        if Dates.is_last_day_of_year(now):
             raise Exception("This year is over.")
 
-        if Dates.is_last_day_of_month(datetime.now()):
+        if Dates.is_last_day_of_month(now):
             # pull from next month on
-            month = Random.get_random_int_in_range(datetime.now().month + 1, 12)
+            month = Random.get_random_int_in_range(now.month + 1, 12)
         else:
             # pull from next day on
-            month = Random.get_random_int_in_range(datetime.now().month, 12)
+            month = Random.get_random_int_in_range(now.month, 12)
 
-        max_days = Dates.get_last_day_of_month(month, datetime.now().year)
+        max_days = Dates.get_last_day_of_month(month, now.year)
 
-        if month == datetime.now().month:
+        if month == now.month:
             # pull from tomorrow on
-            day = Random.get_random_int_in_range(datetime.now().day + 1, max_days)
+            day = Random.get_random_int_in_range(now.day + 1, max_days)
         else:
             # pull from day 1 on
             day = Random.get_random_int_in_range(1, max_days)
 
-        return datetime(datetime.now().year, month, day)
+        return datetime(now.year, month, day)
 
     @staticmethod
     def get_future_date_this_month():
-        if Dates.is_last_day_of_month(datetime.now()):
+        now = Dates.now()
+        if Dates.is_last_day_of_month(now):
             raise Exception("This month is over.")
 
-        max_days = Dates.get_last_day_of_month(datetime.now().month, datetime.now().year)
-        day = Random.get_random_int_in_range(datetime.now().day + 1, max_days)
+        max_days = Dates.get_last_day_of_month(now.month, now.year)
+        day = Random.get_random_int_in_range(now.day + 1, max_days)
 
-        return datetime(datetime.now().year, datetime.now().month, day)
+        return datetime(now.year, now.month, day)
 
     @staticmethod
     def get_date_after(date: datetime) -> datetime:
@@ -81,18 +151,8 @@ class Dates:
 
     @staticmethod
     def get_future_dates(number_of_dates: int) -> list[datetime]:
-        dates = []
-        current_date = datetime.now()
-        for i in range(number_of_dates):
-            current_date = Dates.get_date_after(current_date)
-            dates.append(current_date)
-        return dates
+        return DateWindow().get_future_dates(number_of_dates)
 
     @staticmethod
     def get_past_dates(number_of_dates: int) -> list[datetime]:
-        dates = []
-        current_date = datetime.now()
-        for i in range(number_of_dates):
-            current_date = Dates.get_date_before(current_date)
-            dates.append(current_date)
-        return dates
+        return DateWindow().get_past_dates(number_of_dates)
@@ -0,0 +1,150 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from itertools import islice
+from typing import Iterable, Union
+
+from easypostdevtools.Constants import Export as ExportConstants
+
+
+class Exporter:
+    """
+    Streams generated maps to JSONL, CSV or Parquet files, holding at most one chunk of maps in memory.
+    """
+    CHUNK_SIZE = 1000
+
+    @staticmethod
+    def flatten(_map: dict, prefix: str = "") -> dict:
+        """
+        Flattens nested maps into dotted keys (e.g. `to_address.city`). Lists are kept as JSON strings.
+        """
+        flat = {}
+        for key, value in _map.items():
+            key = f"{prefix}{key}"
+            if isinstance(value, dict):
+                flat.update(Exporter.flatten(value, f"{key}."))
+            elif isinstance(value, (list, tuple)):
+                flat[key] = json.dumps(value, separators=(",", ":"))
+            else:
+                flat[key] = value
+        return flat
+
+    @staticmethod
+    def _chunks(maps: Iterable[dict], chunk_size: int) -> Iterable[list[dict]]:
+        iterator = iter(maps)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _open_text(path: str, compress: bool):
+        if compress:
+            return gzip.open(path, "wt", encoding="utf-8", newline="")
+        return open(path, "w", encoding="utf-8", newline="")
+
+    @staticmethod
+    def write(maps: Iterable[dict], path: str,
+              format: Union[str, ExportConstants.FORMAT] = ExportConstants.FORMAT.JSONL, compress: bool = False,
+              chunk_size: int = None) -> int:
+        """
+        Writes maps to a file.
+        :param maps: The maps to write; any iterable, consumed lazily.
+        :param path: The file to write.
+        :param format: JSONL, CSV or PARQUET.
+        :param compress: Whether to gzip the output (Parquet uses its own gzip codec instead).
+        :param chunk_size: How many maps to hold in memory at once.
+        :return: The number of maps written.
+        """
+        format = ExportConstants.FORMAT(format)
+        chunks = Exporter._chunks(maps, chunk_size or Exporter.CHUNK_SIZE)
+        if format == ExportConstants.FORMAT.JSONL:
+            return Exporter._write_jsonl(chunks, path, compress)
+        if format == ExportConstants.FORMAT.CSV:
+            return Exporter._write_csv(chunks, path, compress)
+        return Exporter._write_parquet(chunks, path, compress)
+
+    @staticmethod
+    def _write_jsonl(chunks: Iterable[list[dict]], path: str, compress: bool) -> int:
+        count = 0
+        with Exporter._open_text(path, compress) as file:
+            for chunk in chunks:
+                file.write("".join(json.dumps(_map, separators=(",", ":")) + "\n" for _map in chunk))
+                count += len(chunk)
+        return count
+
+    @staticmethod
+    def _spool(chunks: Iterable[list[dict]], directory: str) -> tuple[str, list[str], int]:
+        """
+        Flattens every map into a temporary JSONL file, collecting the union of columns in first-seen order.
+        Columns are only known once every map has been generated, so tabular formats are written in a second pass.
+        """
+        columns = {}
+        count = 0
+        descriptor, spool_path = tempfile.mkstemp(suffix=".jsonl", dir=directory)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as spool:
+            for chunk in chunks:
+                rows = [Exporter.flatten(_map) for _map in chunk]
+                for row in rows:
+                    for key in row:
+                        if key not in columns:
+                            columns[key] = None
+                spool.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows))
+                count += len(rows)
+        return spool_path, list(columns), count
+
+    @staticmethod
+    def _read_spool(spool_path: str, chunk_size: int) -> Iterable[list[dict]]:
+        with open(spool_path, encoding="utf-8") as spool:
+            yield from Exporter._chunks((json.loads(line) for line in spool), chunk_size)
+
+    @staticmethod
+    def _write_csv(chunks: Iterable[list[dict]], path: str, compress: bool) -> int:
+        spool_path, columns, count = Exporter._spool(chunks, os.path.dirname(os.path.abspath(path)))
+        try:
+            with Exporter._open_text(path, compress) as file:
+                writer = csv.DictWriter(file, fieldnames=columns)
+                writer.writeheader()
+                for rows in Exporter._read_spool(spool_path, Exporter.CHUNK_SIZE):
+                    writer.writerows(rows)
+        finally:
+            os.remove(spool_path)
+        return count
+
+    @staticmethod
+    def _write_parquet(chunks: Iterable[list[dict]], path: str, compress: bool) -> int:
+        # imported here so that only Parquet exports pay for loading pyarrow
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Exporting to Parquet requires pyarrow")
+        spool_path, columns, count = Exporter._spool(chunks, os.path.dirname(os.path.abspath(path)))
+        writer = None
+        schema = None
+        try:
+            for rows in Exporter._read_spool(spool_path, Exporter.CHUNK_SIZE):
+                data = {column: [row.get(column) for row in rows] for column in columns}
+                if schema is None:
+                    table = pyarrow.table(data)
+                    # a column that is empty throughout the first chunk would otherwise be typed as null
+                    schema = pyarrow.schema([
+                        field.with_type(pyarrow.string()) if pyarrow.types.is_null(field.type) else field
+                        for field in table.schema
+                    ])
+                    table = table.cast(schema)
+                    writer = pyarrow.parquet.ParquetWriter(path, schema,
+                                                           compression="gzip" if compress else "snappy")
+                else:
+                    table = pyarrow.table(data, schema=schema)
+                writer.write_table(table)
+            if writer is None:
+                pyarrow.parquet.write_table(pyarrow.table({}), path)
+        finally:
+            if writer is not None:
+                writer.close()
+            os.remove(spool_path)
+        return count
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from importlib import resources
+from typing import Any, Union
+
+from easypostdevtools.utils.Instrumentation import Instrumentation
+
+PACKAGE = "easypostdevtools"
+FIXTURE_FOLDER = "json"
+BUNDLE_FILE = "json/fixtures.bundle"
+BUNDLE_FORMAT_VERSION = 2
+
+
+class FixtureBundle:
+    """
+    Optional prebuilt bundle of every JSON fixture in the package, loaded with a single read on first use.
+
+    Build it with `python -m easypostdevtools.utils.FixtureBundle`. The bundle is a build artifact and is not
+    committed. It records the modification time and hash of every source file, and a fixture whose file has changed
+    since is read from disk instead, so a stale bundle never hides an edit.
+    """
+    enabled = True
+    _fixtures = None
+    _loaded = False
+    _source_paths = {}
+    _checked = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _package_root():
+        return resources.files(PACKAGE)
+
+    @staticmethod
+    def _source_path(relative_path: str) -> str:
+        source_path = FixtureBundle._source_paths.get(relative_path)
+        if source_path is None:
+            source_path = FixtureBundle._source_paths[relative_path] = str(
+                FixtureBundle._package_root().joinpath(relative_path))
+        return source_path
+
+    @staticmethod
+    def _source_mtime(relative_path: str) -> Union[None, int]:
+        """
+        Returns the modification time of a fixture's loose file, or None if there is none (e.g. a bundle-only install).
+        """
+        try:
+            return os.stat(FixtureBundle._source_path(relative_path)).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def _is_current(relative_path: str, mtime: int, digest: str) -> bool:
+        """
+        Whether a bundled fixture still matches its loose file. The file is only hashed when its modification time
+        differs from the bundled one (installing a package rewrites it), and the verdict is kept until it changes again.
+        """
+        source_mtime = FixtureBundle._source_mtime(relative_path)
+        if source_mtime is None or source_mtime == mtime:
+            return True
+        checked = FixtureBundle._checked.get(relative_path)
+        if checked is None or checked[0] != source_mtime:
+            try:
+                with open(FixtureBundle._source_path(relative_path), "rb") as source:
+                    current = FixtureBundle._digest(source.read()) == digest
+            except OSError:
+                current = True
+            checked = FixtureBundle._checked[relative_path] = (source_mtime, current)
+        return checked[1]
+
+    @staticmethod
+    def _walk(folder, prefix: str, paths: list):
+        entries = {entry.name: entry for entry in folder.iterdir()}
+        for name, entry in sorted(entries.items()):
+            relative_path = f"{prefix}/{name}"
+            if entry.is_dir():
+                FixtureBundle._walk(entry, relative_path, paths)
+            elif name.endswith(".json"):
+                # loose .json files are only kept when there is no minified copy of them
+                if not name.endswith(".min.json") and f"{name[:-len('.json')]}.min.json" in entries:
+                    continue
+                paths.append(relative_path)
+
+    @staticmethod
+    def _walk_package(folder: str) -> list[str]:
+        paths = []
+        FixtureBundle._walk(FixtureBundle._package_root().joinpath(folder), folder, paths)
+        return paths
+
+    @staticmethod
+    def fixture_paths(folder: str = FIXTURE_FOLDER) -> list[str]:
+        """
+        Lists the package-relative paths of every fixture in a folder, preferring minified copies.
+        The bundle's listing is only used when the package has no loose fixture files, so files added since it was
+        built are found.
+        :param folder: The package-relative folder, e.g. `json/addresses`.
+        :return: The sorted fixture paths.
+        """
+        if FixtureBundle._package_root().joinpath(folder).is_dir():
+            return FixtureBundle._walk_package(folder)
+        fixtures = FixtureBundle._load() if FixtureBundle.enabled else None
+        if fixtures is not None:
+            return sorted(path for path in fixtures if path.startswith(f"{folder}/"))
+        return []
+
+    @staticmethod
+    def build(output_path: str = None) -> str:
+        """
+        Parses every JSON fixture in the package and writes them to a single bundle file.
+        :param output_path: Where to write the bundle. Defaults to the bundle location inside the package.
+        :return: The path the bundle was written to.
+        """
+        root = FixtureBundle._package_root()
+        fixtures = {}
+        for path in FixtureBundle._walk_package(FIXTURE_FOLDER):
+            data = root.joinpath(path).read_bytes()
+            fixtures[path] = (FixtureBundle._source_mtime(path), FixtureBundle._digest(data), json.loads(data))
+        if not output_path:
+            output_path = str(FixtureBundle._package_root().joinpath(BUNDLE_FILE))
+        with open(output_path, "wb") as bundle_file:
+            pickle.dump({"version": BUNDLE_FORMAT_VERSION, "fixtures": fixtures}, bundle_file, protocol=4)
+        FixtureBundle.unload()
+        return output_path
+
+    @staticmethod
+    def _load() -> Union[None, dict]:
+        with FixtureBundle._lock:
+            if not FixtureBundle._loaded:
+                bundle = FixtureBundle._package_root().joinpath(BUNDLE_FILE)
+                fixtures = None
+                if bundle.is_file():
+                    data = bundle.read_bytes()
+                    if Instrumentation.enabled:
+                        Instrumentation.count("fixture_bytes_read_total", len(data), source="bundle")
+                    contents = pickle.loads(data)
+                    if contents.get("version") == BUNDLE_FORMAT_VERSION:
+                        fixtures = contents["fixtures"]
+                FixtureBundle._fixtures = fixtures
+                FixtureBundle._loaded = True
+            return FixtureBundle._fixtures
+
+    @staticmethod
+    def get(relative_path: str) -> Any:
+        """
+        Returns a fixture from the bundle.
+        :param relative_path: The package-relative path of the fixture, e.g. `json/carriers.json`.
+        :return: The shared, read-only fixture, or None if there is no bundle, the fixture is not in it, or its file
+        has changed since the bundle was built.
+        """
+        if not FixtureBundle.enabled:
+            return None
+        fixtures = FixtureBundle._fixtures if FixtureBundle._loaded else FixtureBundle._load()
+        if fixtures is None:
+            return None
+        entry = fixtures.get(relative_path)
+        if entry is None:
+            return None
+        mtime, digest, data = entry
+        if not FixtureBundle._is_current(relative_path, mtime, digest):
+            if Instrumentation.enabled:
+                Instrumentation.count("fixture_bundle_stale_total")
+            return None
+        return data
+
+    @staticmethod
+    def unload():
+        """
+        Forgets the loaded bundle so the next lookup reads it again.
+        """
+        with FixtureBundle._lock:
+            FixtureBundle._fixtures = None
+            FixtureBundle._loaded = False
+            FixtureBundle._checked = {}
+
+
+if __name__ == "__main__":
+    print(FixtureBundle.build())
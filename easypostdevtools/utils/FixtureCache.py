@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from easypostdevtools.utils.Instrumentation import Instrumentation
+
+
+class FixtureCache:
+    """
+    Thread-safe, size-bounded cache of parsed fixture files.
+
+    Entries are keyed by resolved path and are re-parsed when the file's modification time changes.
+    Cached objects are shared between callers and must be treated as read-only.
+    """
+    DEFAULT_MAX_SIZE = 64
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._resolved_paths = {}
+        self._lock = threading.RLock()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return self._resolve(path) in self._entries
+
+    def _resolve(self, path: str) -> str:
+        resolved = self._resolved_paths.get(path)
+        if resolved is None:
+            resolved = os.path.realpath(path)
+            self._resolved_paths[path] = resolved
+        return resolved
+
+    def get(self, path: str, loader: Callable[[Any], Any] = json.load) -> Any:
+        """
+        Returns the parsed contents of a file, parsing it only if it is not cached or has changed on disk.
+        :param path: The path to the file.
+        :param loader: The function used to parse the opened file.
+        :return: The parsed (shared) contents of the file.
+        """
+        resolved = self._resolve(path)
+        stat = os.stat(resolved)
+        mtime = stat.st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(resolved)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(resolved)
+                if Instrumentation.enabled:
+                    Instrumentation.count("fixture_cache_hits_total", source="file")
+                return entry[1]
+            if Instrumentation.enabled:
+                Instrumentation.count("fixture_cache_misses_total", source="file")
+                Instrumentation.count("fixture_bytes_read_total", stat.st_size, source="file")
+            with open(resolved) as file:
+                data = loader(file)
+            self._entries[resolved] = (mtime, data)
+            self._entries.move_to_end(resolved)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            return data
+
+    def invalidate(self, path: str):
+        """
+        Removes a single file from the cache.
+        :param path: The path to the file.
+        """
+        with self._lock:
+            self._entries.pop(self._resolve(path), None)
+
+    def clear(self):
+        """
+        Removes every file from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._resolved_paths.clear()
+
+    def resize(self, max_size: int):
+        """
+        Changes the maximum number of cached files, evicting the least recently used files if needed.
+        :param max_size: The new maximum number of cached files.
+        """
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+        with self._lock:
+            self._max_size = max_size
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,71 @@
+import contextvars
+import random
+from typing import Union
+
+_active_generator = contextvars.ContextVar("easypostdevtools_generator", default=None)
+
+
+class Generator:
+    """
+    A seedable source of randomness for every random draw made by the dev tools.
+
+    Install a generator for the current thread or asyncio task (`with Generator(42): ...`) to get a reproducible stream
+    of fixtures. Without an installed generator, draws come from the module-global `random` state.
+    """
+
+    def __init__(self, seed: Union[None, int, str] = None):
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._tokens = []
+
+    @property
+    def seed(self) -> Union[None, int, str]:
+        return self._seed
+
+    @property
+    def random(self) -> random.Random:
+        return self._random
+
+    def spawn(self, index: int) -> "Generator":
+        """
+        Creates an independent generator for a worker or shard.
+        Seeded generators always spawn the same substream for the same index.
+        :param index: The worker or shard index.
+        :return: A new generator.
+        """
+        if self._seed is None:
+            return Generator(self._random.getrandbits(128))
+        return Generator(f"{self._seed}/{index}")
+
+    def install(self) -> contextvars.Token:
+        """
+        Makes this generator the source of randomness for the current thread or asyncio task.
+        :return: A token that can be passed to `Generator.uninstall` to restore the previous generator.
+        """
+        return _active_generator.set(self)
+
+    @staticmethod
+    def uninstall(token: contextvars.Token):
+        _active_generator.reset(token)
+
+    @staticmethod
+    def active() -> Union[None, "Generator"]:
+        return _active_generator.get()
+
+    @staticmethod
+    def current():
+        """
+        Returns the random number generator to draw from in the current context.
+        :return: The installed generator's `random.Random`, or the global `random` module.
+        """
+        generator = _active_generator.get()
+        if generator is None:
+            return random
+        return generator._random
+
+    def __enter__(self) -> "Generator":
+        self._tokens.append(self.install())
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Generator.uninstall(self._tokens.pop())
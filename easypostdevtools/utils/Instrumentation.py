@@ -0,0 +1,311 @@
+import bisect
+import functools
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Union
+from urllib.parse import urlsplit
+
+from easypostdevtools.utils.LazyModule import LazyModule
+
+METRIC_PREFIX = "easypostdevtools_"
+_API_VERSION = re.compile(r"v\d+")
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class InMemorySink:
+    """
+    Keeps every flushed snapshot.
+    """
+
+    def __init__(self):
+        self.snapshots = []
+
+    @property
+    def latest(self) -> Union[None, dict]:
+        return self.snapshots[-1] if self.snapshots else None
+
+    def emit(self, snapshot: dict):
+        self.snapshots.append(snapshot)
+
+
+class LoggingSink:
+    """
+    Logs every flushed snapshot as one JSON line.
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("easypostdevtools.instrumentation")
+        self.level = level
+
+    def emit(self, snapshot: dict):
+        self.logger.log(self.level, "%s", json.dumps(snapshot))
+
+
+class PrometheusSink:
+    """
+    Renders every flushed snapshot in the Prometheus text exposition format, optionally writing it to a file
+    (e.g. for the node exporter's textfile collector).
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.text = ""
+
+    def emit(self, snapshot: dict):
+        self.text = Instrumentation.to_prometheus(snapshot)
+        if self.path:
+            with open(self.path, "w") as file:
+                file.write(self.text)
+
+
+class Instrumentation:
+    """
+    Opt-in counters and latency histograms for fixture reads, random draws, factory calls and API requests.
+
+    Disabled by default: every hook is then a single flag check, and the API client is left unpatched.
+    Usage:
+        Instrumentation.enable(PrometheusSink("metrics.prom"))
+        ...
+        Instrumentation.flush()
+    """
+    enabled = False
+    sink = None
+    _counters = {}
+    _histograms = {}
+    _lock = threading.Lock()
+    _original_request = None
+    _api_pending = False
+    _load_hook_added = False
+
+    @staticmethod
+    def enable(sink: Any = None, api: bool = True):
+        """
+        Starts recording.
+        :param sink: Receives snapshots on `flush()`: an InMemorySink, LoggingSink, PrometheusSink or any object
+        with an `emit(snapshot)` method.
+        :param api: Whether to time every EasyPost API request. The client is not imported for this: if it is not
+        loaded yet, requests are timed from when it is, and never if it is not installed.
+        """
+        if sink is not None:
+            Instrumentation.sink = sink
+        if api:
+            Instrumentation._patch_requestor()
+        Instrumentation.enabled = True
+
+    @staticmethod
+    def disable():
+        Instrumentation.enabled = False
+        Instrumentation._api_pending = False
+        Instrumentation._unpatch_requestor()
+
+    @staticmethod
+    def reset():
+        with Instrumentation._lock:
+            Instrumentation._counters = {}
+            Instrumentation._histograms = {}
+
+    @staticmethod
+    def count(name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with Instrumentation._lock:
+            Instrumentation._counters[key] = Instrumentation._counters.get(key, 0) + amount
+
+    @staticmethod
+    def observe(name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with Instrumentation._lock:
+            histogram = Instrumentation._histograms.get(key)
+            if histogram is None:
+                histogram = Instrumentation._histograms[key] = _Histogram()
+            histogram.observe(seconds)
+
+    @staticmethod
+    def timed(name: str, **labels) -> Callable[[Callable], Callable]:
+        """
+        Decorates a function to record its latency in the `name` histogram and its failures in `name_errors_total`.
+        """
+
+        def decorate(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not Instrumentation.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                except Exception:
+                    Instrumentation.count(f"{name}_errors_total", **labels)
+                    raise
+                finally:
+                    Instrumentation.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+            return wrapper
+
+        return decorate
+
+    @staticmethod
+    def snapshot() -> dict:
+        """
+        Returns a point-in-time copy of every metric.
+        :return: {"counters": [{name, labels, value}], "histograms": [{name, labels, count, sum, buckets}]}, where
+        buckets are cumulative [upper bound, count] pairs.
+        """
+        with Instrumentation._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(Instrumentation._counters.items())]
+            histograms = []
+            for (name, labels), histogram in sorted(Instrumentation._histograms.items()):
+                cumulative = 0
+                buckets = []
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    buckets.append([bound, cumulative])
+                histograms.append({"name": name, "labels": dict(labels), "count": histogram.count,
+                                   "sum": histogram.sum, "buckets": buckets})
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def flush() -> dict:
+        """
+        Sends a snapshot to the sink, if one is set.
+        :return: The snapshot.
+        """
+        snapshot = Instrumentation.snapshot()
+        if Instrumentation.sink is not None:
+            Instrumentation.sink.emit(snapshot)
+        return snapshot
+
+    @staticmethod
+    def to_prometheus(snapshot: dict = None) -> str:
+        snapshot = snapshot or Instrumentation.snapshot()
+
+        def series(name: str, labels: dict) -> str:
+            if not labels:
+                return f"{METRIC_PREFIX}{name}"
+            rendered = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+            return f"{METRIC_PREFIX}{name}{{{rendered}}}"
+
+        lines = []
+        typed = set()
+        for counter in snapshot["counters"]:
+            if counter["name"] not in typed:
+                typed.add(counter["name"])
+                lines.append(f"# TYPE {METRIC_PREFIX}{counter['name']} counter")
+            lines.append(f"{series(counter['name'], counter['labels'])} {counter['value']}")
+        for histogram in snapshot["histograms"]:
+            if histogram["name"] not in typed:
+                typed.add(histogram["name"])
+                lines.append(f"# TYPE {METRIC_PREFIX}{histogram['name']} histogram")
+            for bound, count in histogram["buckets"]:
+                lines.append(f"{series(histogram['name'] + '_bucket', dict(histogram['labels'], le=bound))} {count}")
+            lines.append(f"{series(histogram['name'] + '_sum', histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{series(histogram['name'] + '_count', histogram['labels'])} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _requestor_class() -> Union[None, type]:
+        # easypost 7 keeps the requestor in its own module; earlier clients define it in the package itself
+        try:
+            from easypost.requestor import Requestor
+        except ImportError:
+            try:
+                import easypost
+            except ImportError:
+                return None
+            Requestor = getattr(easypost, "Requestor", None)
+        return Requestor
+
+    @staticmethod
+    def _request_labels(method: Any, url: str) -> dict:
+        # the method is a plain string or, in newer clients, a RequestMethod enum
+        method = str(getattr(method, "value", method)).upper()
+        segments = [segment for segment in urlsplit(str(url)).path.split("/") if segment]
+        if segments and _API_VERSION.fullmatch(segments[0]):
+            segments = segments[1:]
+        return {"method": method, "resource": segments[0] if segments else ""}
+
+    @staticmethod
+    def _patch_requestor():
+        # the API client is only patched while enabled, so disabled instrumentation costs nothing per request
+        if Instrumentation._original_request is not None:
+            return
+        if "easypost" not in sys.modules:
+            # don't import the client just to time it: patch it when the lazy proxy first loads it
+            Instrumentation._api_pending = True
+            if not Instrumentation._load_hook_added:
+                Instrumentation._load_hook_added = True
+                LazyModule.add_load_hook("easypost", Instrumentation._on_client_loaded)
+            return
+        Instrumentation._api_pending = False
+        requestor = Instrumentation._requestor_class()
+        if requestor is None:
+            return
+        original = requestor.request
+
+        @functools.wraps(original)
+        def request(self, method, url, *args, **kwargs):
+            if not Instrumentation.enabled:
+                return original(self, method, url, *args, **kwargs)
+            labels = Instrumentation._request_labels(method, url)
+            start = time.perf_counter()
+            try:
+                return original(self, method, url, *args, **kwargs)
+            except Exception:
+                Instrumentation.count("api_request_errors_total", **labels)
+                raise
+            finally:
+                Instrumentation.observe("api_request_seconds", time.perf_counter() - start, **labels)
+
+        Instrumentation._original_request = original
+        requestor.request = request
+
+    @staticmethod
+    def _on_client_loaded(_module):
+        if Instrumentation.enabled and Instrumentation._api_pending:
+            Instrumentation._patch_requestor()
+
+    @staticmethod
+    def _unpatch_requestor():
+        if Instrumentation._original_request is None:
+            return
+        Instrumentation._requestor_class().request = Instrumentation._original_request
+        Instrumentation._original_request = None
+
+    @staticmethod
+    def instrument_factories(container: type, methods: tuple = ("get", "create")):
+        """
+        Wraps the given methods of every nested factory class in `factory_call` timers.
+        :param container: The class holding the factories, e.g. EasyPostDevTools.
+        :param methods: The method names to wrap.
+        """
+        for factory_name, factory in vars(container).items():
+            if not isinstance(factory, type):
+                continue
+            for method_name in methods:
+                method = factory.__dict__.get(method_name)
+                if isinstance(method, (staticmethod, classmethod)):
+                    timed = Instrumentation.timed("factory_call", factory=factory_name, method=method_name)
+                    setattr(factory, method_name, type(method)(timed(method.__func__)))
@@ -1,9 +1,69 @@
-import json
+import os
+from importlib import resources
 
+from easypostdevtools.utils.FixtureBundle import FixtureBundle, PACKAGE
+from easypostdevtools.utils.FixtureCache import FixtureCache
+from easypostdevtools.utils.Instrumentation import Instrumentation
 from easypostdevtools.utils.Random import Random
 
 
 class JSONReader:
+    cache = FixtureCache()
+    _resolved_paths = {}
+
+    @staticmethod
+    def copy_json_value(item):
+        """
+        Copies a parsed JSON value so callers can modify it without touching the cached copy.
+        :param item: The parsed JSON value.
+        :return: A copy of the value.
+        """
+        if isinstance(item, dict):
+            return {key: JSONReader.copy_json_value(value) for key, value in item.items()}
+        if isinstance(item, list):
+            return [JSONReader.copy_json_value(value) for value in item]
+        return item
+
+    @staticmethod
+    def resolve_path(path: str) -> str:
+        """
+        Resolves a package-relative fixture path (e.g. `json/carriers.json`) against the installed package.
+        Absolute paths, and relative paths that are not package fixtures, are returned unchanged.
+        :param path: The path to the JSON file.
+        :return: The resolved path.
+        """
+        resolved = JSONReader._resolved_paths.get(path)
+        if resolved is None:
+            resolved = path
+            if not os.path.isabs(path):
+                resource = resources.files(PACKAGE).joinpath(path)
+                if resource.is_file():
+                    resolved = str(resource)
+            JSONReader._resolved_paths[path] = resolved
+        return resolved
+
+    @staticmethod
+    def load_json_file(path: str):
+        """
+        Reads a JSON file, preferring the prebuilt fixture bundle unless the file changed after the bundle was built,
+        and otherwise going through the shared fixture cache, so the file is parsed at most once per change on disk.
+        :param path: The path to the JSON file.
+        :return: The shared, read-only JSON value.
+        """
+        data = FixtureBundle.get(path)
+        if data is not None:
+            if Instrumentation.enabled:
+                Instrumentation.count("fixture_cache_hits_total", source="bundle")
+            return data
+        return JSONReader.cache.get(JSONReader.resolve_path(path))
+
+    @staticmethod
+    def clear_cache():
+        """
+        Drops every cached JSON file.
+        """
+        JSONReader.cache.clear()
+
     @staticmethod
     def read_json_file_json(path: str) -> dict:
         """
@@ -11,8 +71,7 @@ class JSONReader:
         :param path: The path to the JSON file.
         :return: The JSON object.
         """
-        with open(path) as json_file:
-            return json.load(json_file)
+        return JSONReader.copy_json_value(JSONReader.load_json_file(path))
 
     @staticmethod
     def read_json_file_array(path: str) -> list:
@@ -21,15 +80,16 @@ class JSONReader:
         :param path: The path to the JSON file.
         :return: The JSON array.
         """
-        with open(path) as json_file:
-            return json.load(json_file)
+        return JSONReader.copy_json_value(JSONReader.load_json_file(path))
 
     @staticmethod
     def get_random_maps_from_json_file(path: str, amount: int, allow_duplicates: bool) -> list[dict]:
-        data = JSONReader.read_json_file_array(path)
-        return Random.get_random_items_from_list(data, amount, allow_duplicates)
+        data = JSONReader.load_json_file(path)
+        items = Random.get_random_items_from_list(data, amount, allow_duplicates)
+        return [JSONReader.copy_json_value(item) for item in items]
 
     @staticmethod
     def get_random_items_from_json_file(path: str, amount: int, allow_duplicates: bool) -> list:
-        data = JSONReader.read_json_file_array(path)
-        return Random.get_random_items_from_list(data, amount, allow_duplicates)
+        data = JSONReader.load_json_file(path)
+        items = Random.get_random_items_from_list(data, amount, allow_duplicates)
+        return [JSONReader.copy_json_value(item) for item in items]
@@ -0,0 +1,57 @@
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Callable
+
+
+class LazyModule:
+    """
+    Stands in for a module that is only imported on first attribute access (or assignment).
+
+    Map generation never touches the API client, so `easypost` (and the `requests` stack behind it) is not loaded
+    until a factory actually creates or retrieves an object.
+    """
+    _load_hooks = {}
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, "_module", module)
+                    for hook in LazyModule._load_hooks.get(self._name, ()):
+                        hook(module)
+        return module
+
+    @staticmethod
+    def add_load_hook(name: str, hook: Callable[[ModuleType], None]):
+        """
+        Calls `hook(module)` whenever a proxy for `name` imports it, so code can act on a module without importing it.
+        :param name: The module name, e.g. `easypost`.
+        :param hook: The callback. It runs once per proxy that loads the module.
+        """
+        LazyModule._load_hooks.setdefault(name, []).append(hook)
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether the module has been imported, through this proxy or elsewhere.
+        """
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute: str, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._name}'{' (loaded)' if self._module is not None else ''}>"
@@ -0,0 +1,116 @@
+from array import array
+from math import sqrt
+from typing import Union
+
+from easypostdevtools.Constants import CarrierParcelLimit, ParcelProfile
+from easypostdevtools.utils.Generator import Generator
+
+_FLOAT_SCALE = 2.0 ** -53
+
+
+class ParcelSampler:
+    """
+    Draws batches of parcel maps from a `ParcelProfile`, optionally clipped to a carrier's size limits.
+
+    By default a batch takes all its randomness from the active generator in one call and maps it through each
+    field's distribution a column at a time, in pure Python. Set `use_numpy` (which requires NumPy) to do the same with
+    NumPy arrays instead. Both backends are reproducible under a seeded generator, but they produce different
+    parcels for the same seed, so every machine sharing a seed must use the same backend. The backend is therefore
+    never chosen from what happens to be installed.
+    """
+    use_numpy = False
+
+    @staticmethod
+    def sample(amount: int, profile: ParcelProfile, limit: Union[None, CarrierParcelLimit] = None) -> list[dict]:
+        """
+        :param amount: The number of parcels to draw.
+        :param profile: The distribution of weights and dimensions.
+        :param limit: The carrier limits to clip parcels to, if any.
+        :return: The parcel maps.
+        """
+        if amount <= 0:
+            return []
+        if ParcelSampler.use_numpy:
+            return ParcelSampler._sample_numpy(amount, profile, limit)
+        return ParcelSampler._sample_python(amount, profile, limit)
+
+    @staticmethod
+    def _sample_numpy(amount: int, profile: ParcelProfile, limit: Union[None, CarrierParcelLimit]) -> list[dict]:
+        # imported here so that importing the dev tools never pays for loading NumPy
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("ParcelSampler.use_numpy requires numpy")
+        # seeding from the active generator keeps NumPy draws reproducible under a seeded generator
+        rng = numpy.random.default_rng(Generator.current().getrandbits(64))
+
+        def draw(spec: tuple):
+            if profile.uniform:
+                return rng.uniform(spec[0], spec[1], amount)
+            return rng.triangular(spec[0], spec[1], spec[2], amount)
+
+        weight = draw(profile.weight)
+        dimensions = numpy.stack([draw(profile.length), draw(profile.width), draw(profile.height)])
+        if not profile.uniform:
+            dimensions = numpy.sort(dimensions, axis=0)[::-1]
+        length, width, height = dimensions
+        if limit:
+            weight = numpy.minimum(weight, limit.max_weight)
+            length = numpy.minimum(length, limit.max_length)
+            width = numpy.minimum(width, limit.max_length)
+            height = numpy.minimum(height, limit.max_length)
+            girth = 2 * (width + height)
+            scale = numpy.minimum(1.0, (limit.max_length_plus_girth - length) / numpy.maximum(girth, 1e-9))
+            width = width * scale
+            height = height * scale
+        return [{"weight": w, "height": h, "width": wd, "length": ln}
+                for w, h, wd, ln in zip(weight.tolist(), height.tolist(), width.tolist(), length.tolist())]
+
+    @staticmethod
+    def _uniforms(amount: int) -> list[float]:
+        # all the randomness in one call: 64 random bits per value, keeping the top 53 as `random.random()` does
+        words = array("Q", Generator.current().randbytes(8 * amount))
+        return [(word >> 11) * _FLOAT_SCALE for word in words]
+
+    @staticmethod
+    def _draw_python(spec: tuple, uniform: bool, units: list[float]) -> list[float]:
+        # maps uniform [0, 1) values through the distribution's inverse CDF, a whole column at a time
+        if uniform:
+            low, high = spec
+            return [low + (high - low) * unit for unit in units]
+        low, mode, high = spec
+        span = high - low
+        if not span:
+            return [low] * len(units)
+        split = (mode - low) / span
+        rising, falling = span * (mode - low), span * (high - mode)
+        return [low + sqrt(unit * rising) if unit < split else high - sqrt((1.0 - unit) * falling) for unit in units]
+
+    @staticmethod
+    def _sample_python(amount: int, profile: ParcelProfile, limit: Union[None, CarrierParcelLimit]) -> list[dict]:
+        units = ParcelSampler._uniforms(4 * amount)
+        weights, lengths, widths, heights = (
+            ParcelSampler._draw_python(spec, profile.uniform, units[index * amount:(index + 1) * amount])
+            for index, spec in enumerate((profile.weight, profile.length, profile.width, profile.height)))
+        if profile.uniform:
+            parcels = zip(weights, lengths, widths, heights)
+        else:
+            parcels = ((weight, *sorted(dimensions, reverse=True))
+                       for weight, dimensions in zip(weights, zip(lengths, widths, heights)))
+        if not limit:
+            return [{"weight": weight, "height": height, "width": width, "length": length}
+                    for weight, length, width, height in parcels]
+
+        maps = []
+        for weight, length, width, height in parcels:
+            weight = min(weight, limit.max_weight)
+            length = min(length, limit.max_length)
+            width = min(width, limit.max_length)
+            height = min(height, limit.max_length)
+            girth = 2 * (width + height)
+            if girth and length + girth > limit.max_length_plus_girth:
+                scale = (limit.max_length_plus_girth - length) / girth
+                width *= scale
+                height *= scale
+            maps.append({"weight": weight, "height": height, "width": width, "length": length})
+        return maps
@@ -1,17 +1,19 @@
-import random
 import string
+import time
 
 from easypostdevtools.models.ExtendedEnum import ExtendedEnum
+from easypostdevtools.utils.Generator import Generator
+from easypostdevtools.utils.Instrumentation import Instrumentation
 
 
 class Random:
     @staticmethod
     def get_random_boolean() -> bool:
-        return bool(random.getrandbits(1))
+        return bool(Generator.current().getrandbits(1))
 
     @staticmethod
     def get_random_int_in_range(minimum: int, maximum: int) -> int:
-        return random.randint(minimum, maximum)
+        return Generator.current().randint(minimum, maximum)
 
     @staticmethod
     def get_random_int() -> int:
@@ -19,7 +21,7 @@ class Random:
 
     @staticmethod
     def get_random_double_in_range(minimum: float, maximum: float) -> float:
-        return random.uniform(minimum, maximum)
+        return Generator.current().uniform(minimum, maximum)
 
     @staticmethod
     def get_random_double() -> float:
@@ -35,31 +37,47 @@ class Random:
 
     @staticmethod
     def get_random_character() -> str:
-        return chr(random.randint(0, 255))
+        return chr(Generator.current().randint(0, 255))
 
     @staticmethod
     def get_random_string_of_length(length: int) -> str:
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+        return ''.join(Generator.current().choices(string.ascii_letters + string.digits, k=length))
 
     @staticmethod
     def get_random_string() -> str:
-        return Random.get_random_string_of_length(random.randint(3, 10))
+        return Random.get_random_string_of_length(Generator.current().randint(3, 10))
 
     @staticmethod
     def get_random_items_from_list(items: list, amount: int, allow_duplicates: bool) -> list:
-        if not allow_duplicates and amount > len(items):
+        """
+        Draws random items from a list without modifying it.
+        Unique draws are O(amount) index selections; draws with duplicates are made in a single call.
+        :param items: The list to draw from.
+        :param amount: The number of items to draw.
+        :param allow_duplicates: Whether the same item can be drawn more than once.
+        :return: The drawn items.
+        """
+        if Instrumentation.enabled:
+            start = time.perf_counter()
+            drawn = Random._draw_items(items, amount, allow_duplicates)
+            Instrumentation.observe("random_draw_seconds", time.perf_counter() - start)
+            Instrumentation.count("random_items_drawn_total", amount)
+            return drawn
+        return Random._draw_items(items, amount, allow_duplicates)
+
+    @staticmethod
+    def _draw_items(items: list, amount: int, allow_duplicates: bool) -> list:
+        if allow_duplicates:
+            if amount > 0 and not items:
+                raise ValueError("Cannot draw items from an empty list")
+            return Generator.current().choices(items, k=amount)
+        if amount > len(items):
             raise ValueError("Amount must be less than or equal to list size when unique is true")
-        selections = []
-        for i in range(amount):
-            choice = random.choice(items)
-            if not allow_duplicates:
-                items.remove(choice)
-            selections.append(choice)
-        return selections
+        return Generator.current().sample(items, amount)
 
     @staticmethod
     def get_random_item_from_list(items: list) -> object:
-        return random.choice(items)
+        return Generator.current().choice(items)
 
     @staticmethod
     def get_random_enum(enum: ExtendedEnum) -> ExtendedEnum:
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Union
+
+
+class ReplayStore:
+    """
+    On-disk record/replay store for API responses, keyed by a canonical hash of the request.
+
+    The first call for a key runs the request and records its response; later calls replay the recording until it
+    expires. The oldest recordings are evicted once the store holds more than `max_entries`.
+    """
+
+    def __init__(self, path: str, ttl: Union[None, float] = None, max_entries: Union[None, int] = None):
+        """
+        :param path: The folder to store recordings in.
+        :param ttl: The number of seconds a recording stays valid, or None to keep it forever.
+        :param max_entries: The maximum number of recordings to keep, or None for no limit.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Max entries must be at least 1")
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def canonical_key(*parts) -> str:
+        """
+        Hashes JSON-serializable request parts into a stable key, independent of dictionary ordering.
+        :return: The hex digest of the canonical request.
+        """
+        canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._path, f"{key}.json")
+
+    def _is_fresh(self, entry_path: str) -> bool:
+        if self._ttl is None:
+            return True
+        return time.time() - os.path.getmtime(entry_path) <= self._ttl
+
+    def get(self, key: str) -> Any:
+        """
+        Returns a recorded response.
+        :param key: The request key.
+        :return: The recorded response, or None if there is no fresh recording.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            if not self._is_fresh(entry_path):
+                os.remove(entry_path)
+                return None
+            with open(entry_path) as entry_file:
+                return json.load(entry_file)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, response: Any):
+        """
+        Records a response, replacing any existing recording for the key.
+        :param key: The request key.
+        :param response: The JSON-serializable response.
+        """
+        handle, temporary_path = tempfile.mkstemp(dir=self._path, suffix=".tmp")
+        with os.fdopen(handle, "w") as entry_file:
+            json.dump(response, entry_file)
+        # atomic rename, so concurrent readers never see a partial recording
+        os.replace(temporary_path, self._entry_path(key))
+        self._evict()
+
+    def _evict(self):
+        if self._max_entries is None:
+            return
+        with self._lock:
+            entries = [entry for entry in os.scandir(self._path) if entry.name.endswith(".json")]
+            if len(entries) <= self._max_entries:
+                return
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - self._max_entries]:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        """
+        Removes every recording.
+        """
+        with self._lock:
+            for entry in os.scandir(self._path):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+
+    def record_or_replay(self, key: str, request: Callable[[], Any], serialize: Callable[[Any], Any],
+                         deserialize: Callable[[Any], Any]) -> Any:
+        """
+        Replays the recorded response for a key, or runs the request and records its response.
+        :param key: The request key.
+        :param request: Makes the real request.
+        :param serialize: Converts the real response into JSON-serializable data.
+        :param deserialize: Converts recorded data back into a response.
+        :return: The response.
+        """
+        recorded = self.get(key)
+        if recorded is not None:
+            return deserialize(recorded)
+        response = request()
+        self.put(key, serialize(response))
+        return response
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from easypostdevtools.utils.ReplayStore import ReplayStore
+
+
+class ShipmentPool:
+    """
+    Thread-safe LRU of recently created shipments, keyed by a canonical hash of the shipment map.
+    Concurrent requests for the same map wait for a single creation.
+    """
+    DEFAULT_MAX_SIZE = 32
+
+    def __init__(self, create: Callable[[dict], Any], max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+        self._create = create
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Any:
+        shipment = self._entries.get(key)
+        if shipment is not None:
+            self._entries.move_to_end(key)
+        return shipment
+
+    def get(self, shipment_map: dict) -> Any:
+        """
+        Returns the shipment created from an identical map, creating it if there is none.
+        :param shipment_map: The shipment map.
+        :return: The shipment.
+        """
+        key = ReplayStore.canonical_key(shipment_map)
+        with self._lock:
+            shipment = self._lookup(key)
+            if shipment is not None:
+                return shipment
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                shipment = self._lookup(key)
+            if shipment is not None:
+                return shipment
+            shipment = self._create(shipment_map)
+            with self._lock:
+                self._entries[key] = shipment
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                self._key_locks.pop(key, None)
+            return shipment
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()